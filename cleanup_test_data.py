@@ -1,18 +1,24 @@
 #!/usr/bin/env python3
 """Remove test plans from database."""
 
+from sqlalchemy import select
+
 from powertochoose_mcp.db.operations import SessionLocal
 from powertochoose_mcp.db.schema import Plan, PlanClassification
 
 db = SessionLocal()
 
-# Find and delete test plans
-test_plans = db.query(Plan).filter(Plan.provider == 'Test Provider').all()
-print(f"Found {len(test_plans)} test plans to delete...")
-
-for plan in test_plans:
-    print(f"  Deleting: {plan.name}")
-    db.delete(plan)
+# Bulk-delete test plans in two statements instead of one DELETE per row.
+# Classifications go first since bulk deletes bypass ORM cascades.
+test_plan_ids = select(Plan.id).where(Plan.provider == "Test Provider")
+db.query(PlanClassification).filter(
+    PlanClassification.plan_id.in_(test_plan_ids)
+).delete(synchronize_session=False)
+
+deleted = db.query(Plan).filter(Plan.provider == "Test Provider").delete(
+    synchronize_session=False
+)
+print(f"Deleted {deleted} test plans")
 
 db.commit()
 
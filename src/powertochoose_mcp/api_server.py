@@ -5,29 +5,38 @@ This server provides HTTP endpoints for analyzing electricity usage and recommen
 It wraps the MCP server and Google ADK agent to provide a clean REST API.
 """
 
+import asyncio
 import os
 import io
 import time
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from contextlib import asynccontextmanager
 
+import httpx
+import numpy as np
 import pandas as pd
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, validator
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, field_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+import aiofiles.os
 
 from google import genai
 from google.adk import agents
 from google.adk.tools.mcp_tool import McpToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import SseConnectionParams
 
+from powertochoose_mcp.config import ZIP_CODES, SUPPORTED_ZIPS
+from powertochoose_mcp.db import operations
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,14 +46,14 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 MCP_SERVER_URL = os.environ.get("MCP_SERVER_URL", "http://localhost:8080/sse")
+MCP_HEALTH_URL = MCP_SERVER_URL.replace("/sse", "/health") if "/sse" in MCP_SERVER_URL else MCP_SERVER_URL
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 ALLOWED_ORIGINS = os.environ.get("ALLOWED_ORIGINS", "https://dijit.tech").split(",")
 UPLOAD_DIR = "/app/uploads"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 RETENTION_HOURS = 1
-
-# Supported ZIP codes (from config)
-SUPPORTED_ZIPS = ["75035", "75024", "75074", "75093", "75034", "75033", "75070"]
+# Uploads are only analyzed in memory; keeping a disk copy is for audit
+PERSIST_UPLOADS = os.environ.get("PERSIST_UPLOADS", "1") == "1"
 
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -58,13 +67,14 @@ power_plan_finder = None
 class AnalyzeRequest(BaseModel):
     """Request model for CSV analysis."""
     zip_code: str
-    
-    @validator('zip_code')
-    def validate_zip(cls, v):
-        if not v.isdigit() or len(v) != 5:
+
+    @field_validator('zip_code')
+    @classmethod
+    def validate_zip(cls, v: str) -> str:
+        if len(v) != 5 or not v.isdigit():
             raise ValueError('Invalid ZIP code format')
         if v not in SUPPORTED_ZIPS:
-            raise ValueError(f'ZIP code {v} not yet supported. Currently available: {", ".join(SUPPORTED_ZIPS)}')
+            raise ValueError(f'ZIP code {v} not yet supported. Currently available: {", ".join(ZIP_CODES)}')
         return v
 
 
@@ -116,45 +126,59 @@ class HealthResponse(BaseModel):
     api: Dict[str, Any]
 
 
-# Cleanup scheduler
-scheduler = BackgroundScheduler()
+# Cleanup scheduler (runs on the app's event loop; created in lifespan)
+scheduler = AsyncIOScheduler()
 
 
-def cleanup_old_uploads():
+async def cleanup_old_uploads():
     """Delete uploaded files older than RETENTION_HOURS."""
     if not os.path.exists(UPLOAD_DIR):
         return
-    
+
     now = time.time()
+    cutoff = RETENTION_HOURS * 3600
+
+    # scandir caches stat results from the directory read; the upload dir
+    # only ever contains files we wrote, so no per-entry isfile check
+    with os.scandir(UPLOAD_DIR) as entries:
+        to_delete = [entry.path for entry in entries if (now - entry.stat().st_mtime) > cutoff]
+
+    if not to_delete:
+        return
+
+    results = await asyncio.gather(
+        *(aiofiles.os.remove(path) for path in to_delete),
+        return_exceptions=True,
+    )
+
     deleted_count = 0
-    
-    for filename in os.listdir(UPLOAD_DIR):
-        filepath = os.path.join(UPLOAD_DIR, filename)
-        if os.path.isfile(filepath):
-            file_age = now - os.path.getmtime(filepath)
-            if file_age > RETENTION_HOURS * 3600:
-                try:
-                    os.remove(filepath)
-                    deleted_count += 1
-                    logger.info(f"Deleted old upload: {filename}")
-                except Exception as e:
-                    logger.error(f"Failed to delete {filename}: {e}")
-    
+    for path, result in zip(to_delete, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to delete {os.path.basename(path)}: {result}")
+        else:
+            deleted_count += 1
+
     if deleted_count > 0:
         logger.info(f"Cleanup: Deleted {deleted_count} old upload(s)")
 
 
+@lru_cache(maxsize=1)
+def get_gemini_client() -> genai.Client:
+    """Get the shared Gemini client (built once, reused across restarts of agents)."""
+    return genai.Client(api_key=GEMINI_API_KEY)
+
+
 def initialize_adk_agents():
     """Initialize Google ADK agents."""
     global search_agent, power_plan_finder
-    
+
     if not GEMINI_API_KEY:
         logger.warning("GEMINI_API_KEY not set - agents will not be initialized")
         return
-    
+
     try:
         # Initialize Gemini client
-        client = genai.Client(api_key=GEMINI_API_KEY)
+        client = get_gemini_client()
         
         # Create MCP toolset
         powertochoose_toolset = McpToolset(
@@ -226,20 +250,24 @@ async def lifespan(app: FastAPI):
     
     # Create upload directory
     os.makedirs(UPLOAD_DIR, exist_ok=True)
-    
+
+    # Shared HTTP client so health probes reuse pooled connections
+    app.state.http_client = httpx.AsyncClient(timeout=2.0)
+
     # Initialize ADK agents
     initialize_adk_agents()
-    
+
     # Start cleanup scheduler
     scheduler.add_job(cleanup_old_uploads, 'interval', minutes=15)
     scheduler.start()
     logger.info("Cleanup scheduler started")
-    
+
     yield
-    
+
     # Shutdown
     logger.info("Shutting down PowerToChoose API server...")
     scheduler.shutdown()
+    await app.state.http_client.aclose()
 
 
 # Create FastAPI app
@@ -247,6 +275,7 @@ app = FastAPI(
     title="PowerToChoose API",
     description="Public API for Texas electricity plan recommendations",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -270,31 +299,47 @@ def analyze_meter_csv(df: pd.DataFrame) -> UsageAnalysis:
     
     Expected columns: Date, Usage, Reading Type
     """
-    # Filter for actual usage readings
-    usage_df = df[df['Reading Type'] == 'Actual'].copy()
-    
+    # Filter for actual usage readings (no .copy() - we only read from the view)
+    usage_df = df[df['Reading Type'].eq('Actual')]
+
     if len(usage_df) == 0:
         raise ValueError("No actual usage readings found in CSV")
-    
-    # Convert date and usage
-    usage_df['Date'] = pd.to_datetime(usage_df['Date'])
-    usage_df['Usage'] = pd.to_numeric(usage_df['Usage'], errors='coerce')
-    
-    # Calculate daily average
-    daily_avg = usage_df.groupby(usage_df['Date'].dt.date)['Usage'].sum().mean()
+
+    # Convert date and usage to NumPy arrays once; all aggregation below is
+    # vectorized instead of repeated pandas groupby passes
+    dates = pd.to_datetime(usage_df['Date'], errors='coerce').to_numpy()
+    usage = pd.to_numeric(usage_df['Usage'], errors='coerce').to_numpy(dtype=np.float64)
+
+    # Drop rows where either conversion failed (matches groupby NaN-skipping)
+    valid = ~(np.isnat(dates) | np.isnan(usage))
+    dates = dates[valid]
+    usage = usage[valid]
+
+    if usage.size == 0:
+        raise ValueError("No actual usage readings found in CSV")
+
+    # Calculate daily average: one bincount pass instead of a groupby
+    days = dates.astype('datetime64[D]')
+    _, day_idx = np.unique(days, return_inverse=True)
+    daily_avg = np.bincount(day_idx, weights=usage).mean()
     monthly_avg = daily_avg * 30
-    
+
     # Detect peak time (if hourly data available)
     if 'Hour' in usage_df.columns or len(usage_df) > 100:
-        usage_df['Hour'] = usage_df['Date'].dt.hour
-        hourly_avg = usage_df.groupby('Hour')['Usage'].mean()
-        peak_hour = hourly_avg.idxmax()
+        hours = (dates - days).astype('timedelta64[h]').astype(np.int64)
+        hour_counts = np.bincount(hours, minlength=24)
+        hour_sums = np.bincount(hours, weights=usage, minlength=24)
+        hourly_avg = np.divide(
+            hour_sums, hour_counts, out=np.zeros_like(hour_sums), where=hour_counts > 0
+        )
+        peak_hour = int(hourly_avg.argmax())
         peak_time = f"{peak_hour:02d}:00"
-        
-        # Calculate peak-to-offpeak ratio
-        peak_usage = hourly_avg.loc[peak_hour]
-        offpeak_hours = [0, 1, 2, 3, 4, 5, 6]  # Typical off-peak
-        offpeak_usage = hourly_avg.loc[offpeak_hours].mean() if any(h in hourly_avg.index for h in offpeak_hours) else hourly_avg.min()
+
+        # Calculate peak-to-offpeak ratio with one boolean mask pass
+        peak_usage = hourly_avg[peak_hour]
+        seen = hour_counts > 0
+        offpeak_mask = np.isin(np.arange(24), [0, 1, 2, 3, 4, 5, 6]) & seen  # Typical off-peak
+        offpeak_usage = hourly_avg[offpeak_mask].mean() if offpeak_mask.any() else hourly_avg[seen].min()
         peak_ratio = peak_usage / offpeak_usage if offpeak_usage > 0 else 1.0
     else:
         peak_time = "20:00"  # Default evening peak
@@ -357,6 +402,19 @@ Use search_agent to find and calculate costs for plans in ZIP {zip_code}."""
         raise HTTPException(status_code=500, detail=f"Agent error: {str(e)}")
 
 
+# Constant fields of the MVP mock recommendation; only the cost fields
+# vary with the analyzed usage, so the rest is built once
+_MOCK_RECOMMENDATION_TEMPLATE = {
+    "plan_id": "mock_1",
+    "plan_name": "Sample Plan (Agent Integration Pending)",
+    "provider": "SAMPLE REP",
+    "renewable_percentage": 50,
+    "contract_months": 12,
+    "cancellation_fee": 150.0,
+    "rating": "good",
+}
+
+
 @app.post("/api/analyze", response_model=AnalyzeResponse)
 @limiter.limit("10/hour")
 async def analyze_csv(
@@ -381,25 +439,64 @@ async def analyze_csv(
     if not csv_file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are accepted")
     
-    # Read and validate file size
-    contents = await csv_file.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE/1024/1024}MB)")
-    
-    # Save temporarily
-    timestamp = int(time.time())
-    filename = f"{timestamp}_{csv_file.filename}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    
     try:
-        with open(filepath, "wb") as f:
-            f.write(contents)
-        
-        # Parse CSV
+        if PERSIST_UPLOADS:
+            # Stream the upload to disk in chunks; never buffer the whole payload
+            timestamp = int(time.time())
+            filename = f"{timestamp}_{csv_file.filename}"
+            filepath = os.path.join(UPLOAD_DIR, filename)
+
+            total_bytes = 0
+            with open(filepath, "wb") as f:
+                while chunk := await csv_file.read(1 << 20):
+                    total_bytes += len(chunk)
+                    if total_bytes > MAX_FILE_SIZE:
+                        raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE/1024/1024}MB)")
+                    f.write(chunk)
+            csv_source = filepath
+        else:
+            # No audit copy wanted: skip the disk round-trip entirely
+            buffer = bytearray()
+            while chunk := await csv_file.read(1 << 20):
+                buffer += chunk
+                if len(buffer) > MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE/1024/1024}MB)")
+            csv_source = io.BytesIO(bytes(buffer))
+
+        # Parse CSV (pyarrow engine: multithreaded parse, Arrow-backed dtypes).
+        # Sniff the header first so malformed files fail before the full
+        # parse, and only parse the columns the analysis actually uses.
+        try:
+            header = pd.read_csv(csv_source, nrows=0).columns
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid CSV format: {str(e)}")
+
+        required_columns = {'Date', 'Usage', 'Reading Type'}
+        missing = required_columns.difference(header)
+        if missing:
+            raise HTTPException(
+                status_code=400,
+                detail=f"CSV missing required column(s): {', '.join(sorted(missing))}"
+            )
+
         try:
-            df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
+            if isinstance(csv_source, io.BytesIO):
+                csv_source.seek(0)
+            df = pd.read_csv(
+                csv_source,
+                engine='pyarrow',
+                usecols=[c for c in ('Date', 'Usage', 'Reading Type', 'ESIID', 'Hour') if c in header],
+            )
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid CSV format: {str(e)}")
+
+        # The audit copy won't be re-read; keep it out of the page cache
+        if PERSIST_UPLOADS and hasattr(os, "posix_fadvise"):
+            fd = os.open(filepath, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
         
         # Analyze usage
         try:
@@ -412,25 +509,21 @@ async def analyze_csv(
         
         # TODO: Parse agent response into structured PlanRecommendation objects
         # For MVP, return mock data structure
+        avg_kwh = usage_analysis.avg_monthly_kwh
+        monthly_cost = round(avg_kwh * 0.12, 2)
         mock_recommendations = [
-            PlanRecommendation(
-                plan_id="mock_1",
-                plan_name="Sample Plan (Agent Integration Pending)",
-                provider="SAMPLE REP",
-                monthly_cost=round(usage_analysis.avg_monthly_kwh * 0.12, 2),
-                renewable_percentage=50,
-                contract_months=12,
-                cancellation_fee=150.0,
-                breakdown=PlanBreakdown(
-                    base_charge_usd=9.95,
-                    energy_charge_usd=round(usage_analysis.avg_monthly_kwh * 0.08, 2),
-                    tdu_delivery_usd=round(usage_analysis.avg_monthly_kwh * 0.03, 2),
-                    taxes_fees_usd=5.0,
-                    total_monthly_usd=round(usage_analysis.avg_monthly_kwh * 0.12, 2)
-                ),
-                rating="good",
-                recommendation_reason=f"Matches your {usage_analysis.pattern_type} usage pattern"
-            )
+            PlanRecommendation.model_validate({
+                **_MOCK_RECOMMENDATION_TEMPLATE,
+                "monthly_cost": monthly_cost,
+                "breakdown": {
+                    "base_charge_usd": 9.95,
+                    "energy_charge_usd": round(avg_kwh * 0.08, 2),
+                    "tdu_delivery_usd": round(avg_kwh * 0.03, 2),
+                    "taxes_fees_usd": 5.0,
+                    "total_monthly_usd": monthly_cost,
+                },
+                "recommendation_reason": f"Matches your {usage_analysis.pattern_type} usage pattern",
+            })
         ]
         
         logger.info(f"Analysis complete for ZIP {zip_code}: {usage_analysis.avg_monthly_kwh} kWh/month")
@@ -455,26 +548,23 @@ async def analyze_csv(
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
-    import httpx
-    from powertochoose_mcp.db import operations
-    
     # Check MCP server
     mcp_healthy = False
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(MCP_SERVER_URL.replace("/sse", "/health") if "/sse" in MCP_SERVER_URL else MCP_SERVER_URL, timeout=2.0)
-            mcp_healthy = response.status_code == 200
+        response = await app.state.http_client.get(MCP_HEALTH_URL)
+        mcp_healthy = response.status_code == 200
     except:
         mcp_healthy = False
     
     # Check database
     try:
-        plan_count = operations.get_plan_count()
-        last_scrape = operations.get_last_scrape_time()
+        async with operations.AsyncSessionLocal() as session:
+            plan_count = await operations.get_plan_count(session)
+            last_scrape = await operations.get_last_scrape_time(session)
         db_info = {
             "total_plans": plan_count,
             "last_scrape": last_scrape.isoformat() if last_scrape else None,
-            "zips_covered": SUPPORTED_ZIPS
+            "zips_covered": ZIP_CODES
         }
     except Exception as e:
         logger.error(f"Database check failed: {e}")
@@ -504,7 +594,7 @@ async def get_plans(request: Request, zip_code: str, renewable: Optional[bool] =
     if zip_code not in SUPPORTED_ZIPS:
         raise HTTPException(
             status_code=400, 
-            detail=f"ZIP {zip_code} not supported. Available: {', '.join(SUPPORTED_ZIPS)}"
+            detail=f"ZIP {zip_code} not supported. Available: {', '.join(ZIP_CODES)}"
         )
     
     # TODO: Query database directly for browsing
@@ -517,25 +607,29 @@ async def get_plans(request: Request, zip_code: str, renewable: Optional[bool] =
     }
 
 
+# Root payload never varies; build it once instead of per request
+_ROOT_PAYLOAD = {
+    "service": "PowerToChoose API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/api/health",
+    "endpoints": {
+        "POST /api/analyze": "Upload CSV and get plan recommendations",
+        "GET /api/plans/{zip_code}": "Browse available plans",
+        "GET /api/health": "Server health check"
+    },
+    "rate_limits": {
+        "analyze": "10 requests/hour",
+        "browse": "30 requests/hour"
+    },
+    "supported_zips": ZIP_CODES
+}
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "service": "PowerToChoose API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/api/health",
-        "endpoints": {
-            "POST /api/analyze": "Upload CSV and get plan recommendations",
-            "GET /api/plans/{zip_code}": "Browse available plans",
-            "GET /api/health": "Server health check"
-        },
-        "rate_limits": {
-            "analyze": "10 requests/hour",
-            "browse": "30 requests/hour"
-        },
-        "supported_zips": SUPPORTED_ZIPS
-    }
+    return _ROOT_PAYLOAD
 
 
 if __name__ == "__main__":
@@ -6,9 +6,84 @@ rate structures parsed from EFLs.
 
 from typing import Dict, Any, List
 
+import numpy as np
+
+# numba is optional: when present the tier-fill kernel is JIT-compiled
+# to machine code; without it the numpy broadcast path below is used
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 from .models import RateStructure, CostBreakdown, RateTier
 from .config import USAGE_TIERS
 
+# Sentinel for open-ended tiers (no upper kWh bound)
+_NO_END = np.iinfo(np.int64).max
+
+
+if njit is not None:
+
+    # Explicit signature so compilation happens at import (and lands in
+    # the on-disk cache) instead of stalling the first calculate call
+    @njit(
+        "Tuple((f8[:], f8[:]))(i8[:], i8[:], f8[:], i8)",
+        cache=True,
+        fastmath=True,
+    )
+    def _tier_fill(starts, ends, rates, usage_kwh):
+        n = starts.size
+        used = np.empty(n, dtype=np.float64)
+        costs = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            k = float(usage_kwh - starts[i])
+            cap = float(ends[i] - starts[i])
+            if k < 0.0:
+                k = 0.0
+            elif k > cap:
+                k = cap
+            used[i] = k
+            costs[i] = k * rates[i]
+        return used, costs
+
+    # Fused variant: one kernel call fills every usage level, reading the
+    # tier arrays once instead of once per level
+    @njit(
+        "Tuple((f8[:, :], f8[:, :]))(i8[:], i8[:], f8[:], i8[:])",
+        cache=True,
+        fastmath=True,
+    )
+    def _tier_fill_all(starts, ends, rates, usages):
+        m = usages.size
+        n = starts.size
+        used = np.empty((m, n), dtype=np.float64)
+        costs = np.empty((m, n), dtype=np.float64)
+        for u in range(m):
+            for i in range(n):
+                k = float(usages[u] - starts[i])
+                cap = float(ends[i] - starts[i])
+                if k < 0.0:
+                    k = 0.0
+                elif k > cap:
+                    k = cap
+                used[u, i] = k
+                costs[u, i] = k * rates[i]
+        return used, costs
+
+else:
+
+    def _tier_fill(starts, ends, rates, usage_kwh):
+        """Vectorized fallback: usage falling in each tier in one pass."""
+        caps = ends - starts
+        used = np.clip(usage_kwh - starts, 0, caps)
+        return used, used * rates
+
+    def _tier_fill_all(starts, ends, rates, usages):
+        """Broadcast fallback: every usage level in one (usages x tiers) pass."""
+        caps = ends - starts
+        used = np.clip(usages[:, None] - starts[None, :], 0, caps[None, :])
+        return used, used * rates
+
 
 class CostCalculator:
     """Calculator for plan costs at different usage levels."""
@@ -21,15 +96,40 @@ class CostCalculator:
         """
         self.rate_structure = rate_structure
 
+        # Precompute tier arrays once so each cost calculation is a single
+        # vectorized pass instead of a Python loop over tier dicts
+        tiers = rate_structure.tiers
+        n = len(tiers)
+        self._starts = np.fromiter((t["start_kwh"] for t in tiers), dtype=np.int64, count=n)
+        self._ends = np.fromiter(
+            (t["end_kwh"] if t.get("end_kwh") is not None else _NO_END for t in tiers),
+            dtype=np.int64,
+            count=n,
+        )
+        self._rates = np.fromiter((t["rate_per_kwh"] for t in tiers), dtype=np.float64, count=n)
+
     def calculate_all_tiers(self) -> Dict[str, CostBreakdown]:
         """Calculate costs for all standard usage tiers.
 
+        All usage levels are filled in one (usages x tiers) broadcast, so
+        the tier math runs once at C level instead of once per level.
+
         Returns:
             Dictionary mapping usage tier to cost breakdown
         """
+        if self._rates.size == 0:
+            return {
+                f"cost_{usage}_kwh": self.calculate_cost(usage)
+                for usage in USAGE_TIERS
+            }
+
+        usages = np.asarray(USAGE_TIERS, dtype=np.int64)
+        used, costs = _tier_fill_all(self._starts, self._ends, self._rates, usages)
         return {
-            f"cost_{usage}_kwh": self.calculate_cost(usage)
-            for usage in USAGE_TIERS
+            f"cost_{usage}_kwh": self._build_breakdown(
+                int(usage), self._breakdown_rows(used[i], costs[i])
+            )
+            for i, usage in enumerate(USAGE_TIERS)
         }
 
     def calculate_cost(self, usage_kwh: int) -> CostBreakdown:
@@ -43,6 +143,20 @@ class CostCalculator:
         """
         # Calculate energy charge using tiered rates
         energy_breakdown = self._calculate_energy_cost(usage_kwh)
+        return self._build_breakdown(usage_kwh, energy_breakdown)
+
+    def _build_breakdown(
+        self, usage_kwh: int, energy_breakdown: List[Dict[str, Any]]
+    ) -> CostBreakdown:
+        """Assemble a CostBreakdown from per-tier energy rows.
+
+        Args:
+            usage_kwh: Usage in kWh per month
+            energy_breakdown: Per-tier dicts from the tier fill
+
+        Returns:
+            CostBreakdown object with detailed cost information
+        """
         energy_cost = sum(tier["cost"] for tier in energy_breakdown)
 
         # Calculate TDU delivery charge
@@ -89,8 +203,7 @@ class CostCalculator:
         Returns:
             List of tier breakdowns
         """
-        tiers = self.rate_structure.tiers
-        if not tiers:
+        if self._rates.size == 0:
             # If no tiers, use a default rate
             return [{
                 "tier": f"0-{usage_kwh}",
@@ -99,39 +212,33 @@ class CostCalculator:
                 "cost": usage_kwh * 0.10,
             }]
 
-        breakdown = []
-        remaining_kwh = usage_kwh
-
-        for i, tier_info in enumerate(tiers):
-            if remaining_kwh <= 0:
-                break
-
-            start_kwh = tier_info["start_kwh"]
-            end_kwh = tier_info.get("end_kwh")
-            rate = tier_info["rate_per_kwh"]
+        # Tier fill runs in the JIT'd or vectorized kernel — one pass,
+        # no Python loop over tier dicts
+        used, costs = _tier_fill(self._starts, self._ends, self._rates, usage_kwh)
+        return self._breakdown_rows(used, costs)
 
-            # Determine how much usage falls in this tier
-            if end_kwh is None:
-                # Last tier (no upper bound)
-                tier_usage = remaining_kwh
-                tier_label = f"{start_kwh}+"
-            else:
-                # Tier with upper bound
-                tier_capacity = end_kwh - start_kwh
-                tier_usage = min(remaining_kwh, tier_capacity)
-                tier_label = f"{start_kwh}-{end_kwh}"
+    def _breakdown_rows(self, used, costs) -> List[Dict[str, Any]]:
+        """Build dict rows for tiers that received usage.
 
-            tier_cost = tier_usage * rate
+        Args:
+            used: kWh filled into each tier
+            costs: Dollar cost per tier
 
+        Returns:
+            List of tier breakdowns
+        """
+        breakdown = []
+        for start, end, rate, kwh, cost in zip(self._starts, self._ends, self._rates, used, costs):
+            if kwh <= 0:
+                continue
+            tier_label = f"{start}+" if end == _NO_END else f"{start}-{end}"
             breakdown.append({
                 "tier": tier_label,
-                "kwh": tier_usage,
-                "rate": rate,
-                "cost": tier_cost,
+                "kwh": int(kwh),
+                "rate": float(rate),
+                "cost": float(cost),
             })
 
-            remaining_kwh -= tier_usage
-
         return breakdown
 
     def _calculate_tdu_cost(self, usage_kwh: int) -> float:
@@ -150,6 +257,11 @@ class CostCalculator:
         return usage_kwh * 0.04
 
 
+# Memoization cache: many plans share identical rate structures (same
+# provider/product family), so tier math only runs once per unique structure
+_cost_cache: Dict[tuple, Dict[str, Dict[str, Any]]] = {}
+
+
 def calculate_plan_costs(rate_structure: RateStructure) -> Dict[str, Dict[str, Any]]:
     """Calculate costs for all standard tiers for a plan.
 
@@ -159,11 +271,54 @@ def calculate_plan_costs(rate_structure: RateStructure) -> Dict[str, Dict[str, A
     Returns:
         Dictionary with cost breakdowns for each tier
     """
+    cache_key = (
+        rate_structure.base_charge,
+        rate_structure.tdu_delivery_rate,
+        tuple(
+            (t["start_kwh"], t.get("end_kwh"), t["rate_per_kwh"])
+            for t in rate_structure.tiers
+        ),
+    )
+    cached = _cost_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     calculator = CostCalculator(rate_structure)
     result = calculator.calculate_all_tiers()
 
     # Convert CostBreakdown objects to dictionaries
-    return {
+    costs = {
         key: breakdown.model_dump()
         for key, breakdown in result.items()
     }
+    _cost_cache[cache_key] = costs
+    return costs
+
+
+calculate_plan_costs.cache_clear = _cost_cache.clear
+
+
+def summarize_rate_structure(rate_structure: Dict[str, Any]) -> str:
+    """Create a human-readable summary of rate structure.
+
+    Args:
+        rate_structure: Rate structure dictionary
+
+    Returns:
+        Summary string
+    """
+    plan_type = rate_structure.get("plan_type", "fixed")
+    base_charge = rate_structure.get("base_charge", 0)
+    tiers = rate_structure.get("tiers", [])
+
+    summary_parts = [f"{plan_type.replace('_', ' ').title()} rate"]
+
+    if base_charge > 0:
+        summary_parts.append(f"${base_charge:.2f} base charge")
+
+    if tiers:
+        # Show first tier rate
+        first_tier_rate = tiers[0].get("rate_per_kwh", 0)
+        summary_parts.append(f"from ${first_tier_rate:.4f}/kWh")
+
+    return ", ".join(summary_parts)
@@ -16,7 +16,8 @@ EFL_DIR.mkdir(parents=True, exist_ok=True)
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initial ZIP codes (North Texas - Frisco area)
-ZIP_CODES = [
+# Ordered tuple for display; frozenset for O(1) membership checks
+ZIP_CODES = (
     "75035",  # Frisco
     "75024",  # Plano (west)
     "75074",  # Plano (east)
@@ -24,7 +25,12 @@ ZIP_CODES = [
     "75034",  # Frisco (north)
     "75033",  # Frisco (south)
     "75070",  # McKinney
-]
+)
+SUPPORTED_ZIPS = frozenset(ZIP_CODES)
+
+# ZIPs partitioned into the 7 day-of-week scrape buckets, computed once at
+# import instead of re-deriving int(zip) % 7 on every scrape
+BUCKET_ZIPS = [[z for z in ZIP_CODES if int(z) % 7 == b] for b in range(7)]
 
 # Usage tiers for cost calculation (kWh per month)
 USAGE_TIERS = [500, 1000, 2000]
@@ -39,8 +45,22 @@ POWERTOCHOOSE_BASE_URL = "http://www.powertochoose.org"
 REQUEST_DELAY_SECONDS = 1.0  # Delay between requests to respect rate limits
 REQUEST_TIMEOUT_SECONDS = 30.0
 
-# Database configuration
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+# Database configuration. DATABASE_PATH=":memory:" selects a single named
+# shared-cache in-memory database across all engines (the test suite uses
+# this so every session sees the same schema and rows).
+SQLITE_IN_MEMORY = ":memory:" in str(DATABASE_PATH)
+if SQLITE_IN_MEMORY:
+    _MEMORY_URI = "file:powertochoose_mem?mode=memory&cache=shared&uri=true"
+    SQLALCHEMY_DATABASE_URL = f"sqlite:///{_MEMORY_URI}"
+    SQLALCHEMY_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{_MEMORY_URI}"
+    # mode=ro cannot outlive the writer connections on a memory database,
+    # so readers share the writer URL here
+    SQLALCHEMY_READONLY_DATABASE_URL = SQLALCHEMY_DATABASE_URL
+else:
+    SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+    SQLALCHEMY_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+    # Read-only URI so reader connections can never take a write lock
+    SQLALCHEMY_READONLY_DATABASE_URL = f"sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true"
 SQLALCHEMY_CONNECT_ARGS = {"check_same_thread": False}
 
 # Enable WAL mode for SQLite (better concurrent access)
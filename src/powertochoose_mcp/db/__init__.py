@@ -3,11 +3,17 @@
 from .schema import Base, Plan, PlanClassification, RequestLog
 from .operations import (
     get_session,
+    get_read_session,
+    get_write_session,
+    get_async_session,
     init_database,
     store_plan,
     get_plans_by_zip,
+    get_plan_summaries_by_zip,
     get_plan_by_id,
+    get_cached_plan,
     log_request,
+    flush_request_logs,
 )
 
 __all__ = [
@@ -16,9 +22,15 @@ __all__ = [
     "PlanClassification",
     "RequestLog",
     "get_session",
+    "get_read_session",
+    "get_write_session",
+    "get_async_session",
     "init_database",
     "store_plan",
     "get_plans_by_zip",
+    "get_plan_summaries_by_zip",
     "get_plan_by_id",
+    "get_cached_plan",
     "log_request",
+    "flush_request_logs",
 ]
@@ -1,32 +1,175 @@
 """Database operations and queries."""
 
-from contextlib import contextmanager
+import atexit
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+import orjson
 from typing import List, Optional
-from sqlalchemy import create_engine, select, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import bindparam, create_engine, delete, event, func, insert, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import load_only, scoped_session, selectinload, sessionmaker, undefer_group, Session
+from sqlalchemy.pool import StaticPool
 
 from ..config import (
     SQLALCHEMY_DATABASE_URL,
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    SQLALCHEMY_READONLY_DATABASE_URL,
     SQLALCHEMY_CONNECT_ARGS,
     SQLITE_ENABLE_WAL,
+    SQLITE_IN_MEMORY,
 )
 from .schema import Base, Plan, PlanClassification, RequestLog
 
 
-# Create engine and session factory
+def _json_serializer(obj) -> str:
+    """orjson-backed serializer for the JSON column type."""
+    return orjson.dumps(obj).decode()
+
+
+# Create engine and session factory. The pool is sized explicitly so
+# concurrent MCP/API traffic doesn't exhaust the default QueuePool
+# (size 5, overflow 10) and stall waiting for a connection. LIFO checkout
+# keeps a small hot set of connections in rotation so the others age out
+# via pool_recycle instead of all N file handles staying warm; pre-ping is
+# pointless for a local SQLite file and just adds a round trip. In-memory
+# databases pin a single connection (StaticPool) so the shared-cache DB
+# lives as long as the engine.
+_POOL_KWARGS = (
+    {"poolclass": StaticPool}
+    if SQLITE_IN_MEMORY
+    else {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_use_lifo": True,
+        "pool_pre_ping": False,
+        "pool_recycle": 3600,
+    }
+)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=SQLALCHEMY_CONNECT_ARGS,
     echo=False,
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **_POOL_KWARGS,
+)
+SessionLocal = scoped_session(
+    sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=engine,
+    )
+)
+
+# Async engine and session factory for the FastAPI server so endpoint
+# queries await instead of blocking the event loop
+async_engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    connect_args=SQLALCHEMY_CONNECT_ARGS,
+    echo=False,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+# Classic SQLite split: many readers on a mode=ro connection that can never
+# take a write lock, one writer at a time serialized by a process-local
+# mutex so concurrent MCP tools queue in Python instead of on the file lock
+read_engine = (
+    engine
+    if SQLITE_IN_MEMORY
+    else create_engine(
+        SQLALCHEMY_READONLY_DATABASE_URL,
+        connect_args=SQLALCHEMY_CONNECT_ARGS,
+        echo=False,
+        pool_size=20,
+        max_overflow=40,
+        pool_use_lifo=True,
+        pool_recycle=3600,
+        query_cache_size=1200,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
+)
+ReadSessionLocal = scoped_session(
+    sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=read_engine,
+    )
+)
+_write_lock = threading.Lock()
+
+
+def _set_sqlite_pragma(dbapi_conn, _connection_record):
+    """Apply performance PRAGMAs on every new SQLite connection.
+
+    WAL batches writes instead of fsyncing per commit and lets readers
+    proceed while a writer holds the log; the rest size the page cache
+    and enable mmap'd reads.
+    """
+    cursor = dbapi_conn.cursor()
+    if SQLITE_ENABLE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=30000")  # wait instead of SQLITE_BUSY
+    cursor.execute("PRAGMA foreign_keys=ON")  # honor ON DELETE CASCADE
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB mmap
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _set_sqlite_read_pragma(dbapi_conn, _connection_record):
+    """Reader-side PRAGMAs only; journal/sync settings are writer concerns."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+event.listen(engine, "connect", _set_sqlite_pragma)
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragma)
+event.listen(read_engine, "connect", _set_sqlite_read_pragma)
+
+# Hot-path statements built once at import. With bindparam placeholders the
+# compiled SQL is cached by structural identity, so repeated calls skip
+# clause construction and compilation entirely.
+_STMT_PLAN_BY_ID = (
+    select(Plan)
+    .options(undefer_group("json_blobs"))
+    .where(Plan.id == bindparam("pid"))
+)
+_STMT_PLANS_BY_ZIP = (
+    select(Plan)
+    .options(undefer_group("json_blobs"), selectinload(Plan.classifications))
+    .where(Plan.zip_code == bindparam("zip"), Plan.efl_parsed == 1)
+    .order_by(Plan.name)
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @contextmanager
 def get_session():
-    """Get a database session with automatic cleanup."""
-    session = SessionLocal()
+    """Get a database session with automatic cleanup.
+
+    Builds a fresh Session from the factory rather than the thread-local
+    scoped registry: concurrent asyncio tasks (e.g. the per-ZIP scrapes
+    in scrape_bucket) all share one loop thread, and a thread-scoped
+    session would let one task commit or roll back another's in-flight
+    transaction.
+    """
+    session = SessionLocal.session_factory()
     try:
         yield session
         session.commit()
@@ -37,10 +180,81 @@ def get_session():
         session.close()
 
 
+@contextmanager
+def get_read_session():
+    """Get a read-only database session (mode=ro connection, no commit)."""
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        ReadSessionLocal.remove()
+
+
+@contextmanager
+def get_write_session():
+    """Get a writable session serialized behind the process write mutex.
+
+    SQLite allows one writer at a time; queueing writers here avoids
+    busy-waiting on the file lock under concurrent MCP tool calls.
+    """
+    with _write_lock:
+        with get_session() as session:
+            yield session
+
+
+@asynccontextmanager
+async def get_async_session():
+    """Get an async database session with automatic cleanup."""
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def _migrate_schema():
+    """Bring a pre-existing database file up to the current schema.
+
+    Base.metadata.create_all only creates tables that are missing
+    entirely; columns and indexes later added to the model (e.g.
+    rate_structure_summary, efl_etag, the composite plan indexes) never
+    reach an existing database and every SELECT against it fails with
+    "no such column". All added columns are nullable, so SQLite's
+    ALTER TABLE ... ADD COLUMN covers them; indexes are created with
+    checkfirst so this is a no-op on an up-to-date file.
+    """
+    with engine.connect() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {
+                row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))
+            }
+            for column in table.columns:
+                if column.name not in existing:
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {table.name} ADD COLUMN "
+                            f"{column.name} {column.type.compile(engine.dialect)}"
+                        )
+                    )
+        conn.commit()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def init_database():
-    """Initialize the database and enable WAL mode for SQLite."""
-    # Create all tables
+    """Initialize the database and enable WAL mode for SQLite.
+
+    WAL is persistent in the database file, so it is set once here; the
+    non-persistent PRAGMAs (synchronous, busy_timeout, cache/mmap sizing)
+    are reapplied per connection by the engine connect event.
+    """
+    # Create all tables, then patch up anything added since the file
+    # was first created
     Base.metadata.create_all(bind=engine)
+    _migrate_schema()
 
     # Enable WAL mode for better concurrent access
     if SQLITE_ENABLE_WAL:
@@ -49,47 +263,60 @@ def init_database():
             conn.commit()
 
 
-def store_plan(session: Session, plan_data: dict, classifications: List[str]) -> Plan:
+def store_plan(
+    session: Session,
+    plan_data: dict,
+    classifications: List[str],
+    now: Optional[datetime] = None,
+) -> Plan:
     """Store or update a plan in the database.
 
     Args:
         session: Database session
         plan_data: Dictionary containing plan fields
         classifications: List of classification tags
+        now: Scrape timestamp; batch callers pass one value for the whole
+            batch instead of paying a datetime.utcnow() per row
 
     Returns:
         Stored Plan object
     """
-    # Check if plan already exists
-    existing_plan = session.query(Plan).filter(Plan.id == plan_data["id"]).first()
-
-    if existing_plan:
-        # Update existing plan
-        for key, value in plan_data.items():
-            setattr(existing_plan, key, value)
-        existing_plan.scraped_at = datetime.utcnow()
-        plan = existing_plan
-
-        # Remove old classifications
-        session.query(PlanClassification).filter(
-            PlanClassification.plan_id == plan.id
-        ).delete()
-    else:
-        # Create new plan
-        plan = Plan(**plan_data)
-        session.add(plan)
-
-    # Add classifications
-    for classification in classifications:
-        plan_classification = PlanClassification(
-            plan_id=plan.id,
-            classification=classification,
-            source="website",
+    # Native upsert: one statement covers both the new-plan and update
+    # paths instead of SELECT-then-UPDATE/INSERT round trips
+    stmt = sqlite_insert(Plan).values(
+        **plan_data, scraped_at=now or datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Plan.id],
+        set_={
+            **{k: stmt.excluded[k] for k in plan_data if k != "id"},
+            "scraped_at": stmt.excluded.scraped_at,
+        },
+    )
+    session.execute(stmt)
+
+    # Replace classifications wholesale; a single executemany beats
+    # per-row session.add
+    session.execute(
+        delete(PlanClassification).where(
+            PlanClassification.plan_id == plan_data["id"]
+        )
+    )
+    if classifications:
+        session.execute(
+            insert(PlanClassification),
+            [
+                {
+                    "plan_id": plan_data["id"],
+                    "classification": classification,
+                    "source": "website",
+                }
+                for classification in classifications
+            ],
         )
-        session.add(plan_classification)
 
-    session.flush()
-    return plan
+    get_cached_plan.cache_clear()
+    return session.get(Plan, plan_data["id"])
 
 
 def get_plans_by_zip(
@@ -97,6 +324,7 @@ def get_plans_by_zip(
     zip_code: str,
     classifications: Optional[List[str]] = None,
     only_complete: bool = True,
+    limit: Optional[int] = None,
 ) -> List[Plan]:
     """Get plans for a specific ZIP code.
 
@@ -105,56 +333,234 @@ def get_plans_by_zip(
         zip_code: ZIP code to filter by
         classifications: Optional list of classifications to filter by
         only_complete: If True, only return plans with successful EFL parsing
+        limit: Optional maximum number of rows, applied as SQL LIMIT so
+            excluded rows are never hydrated
 
     Returns:
         List of Plan objects
     """
-    query = session.query(Plan).filter(Plan.zip_code == zip_code)
+    if only_complete and not classifications and limit is None:
+        # Common case: reuse the precompiled statement
+        return list(session.scalars(_STMT_PLANS_BY_ZIP, {"zip": zip_code}).all())
+
+    stmt = (
+        select(Plan)
+        .options(undefer_group("json_blobs"), selectinload(Plan.classifications))
+        .where(Plan.zip_code == zip_code)
+    )
 
     if only_complete:
-        query = query.filter(Plan.efl_parsed == 1)
+        stmt = stmt.where(Plan.efl_parsed == 1)
 
     if classifications:
         # Filter by classifications (plans must have at least one matching classification)
-        query = query.join(PlanClassification).filter(
+        stmt = stmt.join(PlanClassification).where(
+            PlanClassification.classification.in_(classifications)
+        )
+
+    stmt = stmt.order_by(Plan.name)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return list(session.scalars(stmt).all())
+
+
+def get_plan_summaries_by_zip(
+    session: Session,
+    zip_code: str,
+    classifications: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> List[Plan]:
+    """Get plans for a ZIP code with only summary columns loaded.
+
+    Projects the fields list views actually render — scalars plus the
+    1000 kWh cost and rate structure for the summary line — and leaves
+    the remaining JSON blobs deferred, so each row costs a few scalars
+    instead of every cost breakdown. Classifications come back in one
+    batched IN query rather than a lazy load per row.
+
+    Args:
+        session: Database session
+        zip_code: ZIP code to filter by
+        classifications: Optional list of classifications to filter by
+        limit: Optional maximum number of rows, applied as SQL LIMIT so
+            excluded rows are never hydrated
+
+    Returns:
+        List of partially loaded Plan objects
+    """
+    stmt = (
+        select(Plan)
+        .options(
+            load_only(
+                Plan.id,
+                Plan.name,
+                Plan.provider,
+                Plan.contract_length_months,
+                Plan.renewable_percentage,
+                Plan.scraped_at,
+                Plan.rate_structure_summary,
+                Plan.cost_1000_kwh,
+                Plan.rate_structure,
+            ),
+            selectinload(Plan.classifications),
+        )
+        .where(Plan.zip_code == zip_code, Plan.efl_parsed == 1)
+    )
+
+    if classifications:
+        stmt = stmt.join(PlanClassification).where(
             PlanClassification.classification.in_(classifications)
         )
 
-    return query.order_by(Plan.name).all()
+    stmt = stmt.order_by(Plan.name)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return list(session.scalars(stmt).all())
 
 
-def get_plan_by_id(session: Session, plan_id: str) -> Optional[Plan]:
+def get_plan_by_id(session: Session, plan_id: str, eager: bool = False) -> Optional[Plan]:
     """Get a plan by its ID.
 
     Args:
         session: Database session
         plan_id: Plan identifier
+        eager: Load classifications up front (selectinload) so callers
+            can touch them after the session closes without a lazy query
 
     Returns:
         Plan object or None if not found
     """
-    return session.query(Plan).filter(Plan.id == plan_id).first()
+    stmt = _STMT_PLAN_BY_ID
+    if eager:
+        stmt = stmt.options(selectinload(Plan.classifications))
+    return session.scalars(stmt, {"pid": plan_id}).first()
+
+
+# Plans only change when a scrape writes them, so cached reads stay valid
+# for at most one TTL window even if an out-of-process writer slips past
+# the in-process invalidation in store_plan.
+_PLAN_CACHE_TTL_SECONDS = 3600
+
+
+@lru_cache(maxsize=4096)
+def _get_cached_plan_in_window(plan_id: str, _ttl_window: int) -> Optional[Plan]:
+    with get_read_session() as session:
+        plan = get_plan_by_id(session, plan_id)
+        if plan is not None:
+            session.expunge(plan)
+        return plan
+
+
+def get_cached_plan(plan_id: str) -> Optional[Plan]:
+    """Get a plan by ID from an in-process read cache.
+
+    Opens a short-lived session and returns the plan detached, so repeat
+    reads of the same plan (MCP tool re-entries) skip the database and
+    the JSON column deserialization entirely. store_plan clears the cache
+    whenever plan data changes, and entries expire on their own when the
+    hourly TTL window rolls over.
+
+    Args:
+        plan_id: Plan identifier
+
+    Returns:
+        Detached Plan object or None if not found
+    """
+    return _get_cached_plan_in_window(
+        plan_id, int(time.time() // _PLAN_CACHE_TTL_SECONDS)
+    )
 
 
-def log_request(session: Session, tool_name: str, parameters: dict, result_count: int):
-    """Log an MCP tool request.
+get_cached_plan.cache_clear = _get_cached_plan_in_window.cache_clear
+
+
+# Request logging is non-critical and write-heavy, so entries are buffered
+# in memory and flushed in one bulk INSERT per interval instead of paying a
+# synchronous write per MCP call. deque append/popleft are atomic in
+# CPython, so producers need no lock.
+_log_buffer: deque = deque(maxlen=10000)
+_LOG_FLUSH_INTERVAL_SECONDS = 1.0
+_log_flusher_started = False
+_log_flusher_lock = threading.Lock()
+
+
+def flush_request_logs():
+    """Flush buffered request logs to the database in one transaction."""
+    batch = []
+    while _log_buffer:
+        try:
+            batch.append(_log_buffer.popleft())
+        except IndexError:
+            break
+    if batch:
+        with get_write_session() as session:
+            session.execute(insert(RequestLog), batch)
+
+
+def _log_flusher_loop():
+    while True:
+        time.sleep(_LOG_FLUSH_INTERVAL_SECONDS)
+        try:
+            flush_request_logs()
+        except Exception:
+            # Logging must never take down the flusher; entries stay
+            # buffered and the next tick retries
+            pass
+
+
+def _ensure_log_flusher():
+    # In :memory: mode the StaticPool pins every sync session to one DBAPI
+    # connection, so a background thread committing on it would clobber
+    # whatever transaction the main thread holds. Callers flush inline
+    # instead (see log_request); nothing to start.
+    if SQLITE_IN_MEMORY:
+        return
+    global _log_flusher_started
+    if _log_flusher_started:
+        return
+    with _log_flusher_lock:
+        if not _log_flusher_started:
+            threading.Thread(target=_log_flusher_loop, daemon=True).start()
+            atexit.register(flush_request_logs)
+            _log_flusher_started = True
+
+
+def log_request(
+    session: Optional[Session],
+    tool_name: str,
+    parameters: dict,
+    result_count: int,
+    now: Optional[datetime] = None,
+):
+    """Buffer an MCP tool request log entry.
+
+    Entries land in an in-process ring buffer and are written by a
+    background thread (or atexit); call flush_request_logs() to force
+    them out, e.g. before reading the table.
 
     Args:
-        session: Database session
+        session: Unused; retained for call-site compatibility
         tool_name: Name of the MCP tool
         parameters: Tool parameters
         result_count: Number of results returned
+        now: Request timestamp; batch callers pass one value per batch
     """
-    classifications_used = parameters.get("classifications")
-
-    log_entry = RequestLog(
-        tool_name=tool_name,
-        parameters=parameters,
-        result_count=result_count,
-        classifications_used=classifications_used,
+    _ensure_log_flusher()
+    _log_buffer.append(
+        {
+            "timestamp": now or datetime.utcnow(),
+            "tool_name": tool_name,
+            "parameters": parameters,
+            "result_count": result_count,
+            "classifications_used": parameters.get("classifications"),
+        }
     )
-    session.add(log_entry)
-    session.flush()
+    # Deterministic inline flush in :memory: mode, where the flusher
+    # thread is never started (single shared connection)
+    if SQLITE_IN_MEMORY:
+        flush_request_logs()
 
 
 def cleanup_old_data(session: Session, retention_days: int):
@@ -165,8 +571,13 @@ def cleanup_old_data(session: Session, retention_days: int):
         retention_days: Number of days to retain data
     """
     cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
-    session.query(Plan).filter(Plan.scraped_at < cutoff_date).delete()
-    session.flush()
+    # Single bulk DELETE; classifications go with their plans via the
+    # ON DELETE CASCADE foreign key (foreign_keys=ON is set per connection)
+    session.execute(
+        delete(Plan)
+        .where(Plan.scraped_at < cutoff_date)
+        .execution_options(synchronize_session=False)
+    )
 
 
 def cleanup_old_logs(session: Session, retention_days: int):
@@ -177,27 +588,37 @@ def cleanup_old_logs(session: Session, retention_days: int):
         retention_days: Number of days to retain logs
     """
     cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
-    session.query(RequestLog).filter(RequestLog.timestamp < cutoff_date).delete()
-    session.flush()
+    session.execute(
+        delete(RequestLog)
+        .where(RequestLog.timestamp < cutoff_date)
+        .execution_options(synchronize_session=False)
+    )
 
 
-def get_plan_count() -> int:
+async def get_plan_count(session: AsyncSession) -> int:
     """Get total number of plans in database.
-    
+
+    Args:
+        session: Async database session
+
     Returns:
         Total count of plans
     """
-    with get_session() as session:
-        return session.query(Plan).count()
+    result = await session.execute(select(func.count(Plan.id)))
+    return result.scalar_one()
 
 
-def get_last_scrape_time() -> Optional[datetime]:
+async def get_last_scrape_time(session: AsyncSession) -> Optional[datetime]:
     """Get timestamp of most recent scrape.
-    
+
+    Args:
+        session: Async database session
+
     Returns:
         Datetime of last scrape or None if no plans exist
     """
-    with get_session() as session:
-        result = session.query(Plan).order_by(Plan.scraped_at.desc()).first()
-        return result.scraped_at if result else None
+    result = await session.execute(
+        select(Plan.scraped_at).order_by(Plan.scraped_at.desc()).limit(1)
+    )
+    return result.scalar_one_or_none()
 
@@ -12,8 +12,9 @@ from sqlalchemy import (
     UniqueConstraint,
     Index,
     JSON,
+    text,
 )
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, deferred, relationship
 
 Base = declarative_base()
 
@@ -26,26 +27,50 @@ class Plan(Base):
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
     provider = Column(String, nullable=False)
-    zip_code = Column(String, nullable=False, index=True)
+    zip_code = Column(String, nullable=False)
     contract_length_months = Column(Integer)
     renewable_percentage = Column(Integer)
     cancellation_fee = Column(Float)
 
-    # Calculator data (stored as JSON)
-    rate_structure = Column(JSON, nullable=False)
-    cost_500_kwh = Column(JSON, nullable=False)
-    cost_1000_kwh = Column(JSON, nullable=False)
-    cost_2000_kwh = Column(JSON, nullable=False)
+    # Calculator data (stored as JSON). Deferred as one group so summary
+    # queries skip deserializing the blobs; callers that need them load
+    # all four with a single undefer_group.
+    # One-line summary computed at scrape time so list views never touch
+    # the rate_structure blob
+    rate_structure_summary = Column(String)
+    rate_structure = deferred(Column(JSON, nullable=False), group="json_blobs")
+    cost_500_kwh = deferred(Column(JSON, nullable=False), group="json_blobs")
+    cost_1000_kwh = deferred(Column(JSON, nullable=False), group="json_blobs")
+    cost_2000_kwh = deferred(Column(JSON, nullable=False), group="json_blobs")
 
     # Metadata
     scraped_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     efl_url = Column(String)
+    efl_etag = Column(String)  # HTTP ETag of the last-downloaded EFL PDF
     plan_url = Column(String)
     efl_parsed = Column(Integer, default=1)  # 1=success, 0=failed
 
     # Relationships
     classifications = relationship("PlanClassification", back_populates="plan", cascade="all, delete-orphan")
 
+    # Composite indexes so ZIP-filtered queries (provider lookups, browse
+    # filters on renewable/contract length) are index range scans; zip_code
+    # needs no standalone index since it prefixes these. The partial index
+    # matches get_plans_by_zip's only_complete branch exactly and satisfies
+    # its ORDER BY name without a sort step, while staying smaller than a
+    # three-column composite — efl_parsed lives in the WHERE clause, not
+    # the B-tree key, and nearly all rows qualify anyway.
+    __table_args__ = (
+        Index(
+            "idx_plan_zip_name_parsed",
+            "zip_code",
+            "name",
+            sqlite_where=text("efl_parsed = 1"),
+        ),
+        Index("ix_plan_zip_prov", "zip_code", "provider"),
+        Index("ix_plan_browse", "zip_code", "renewable_percentage", "contract_length_months"),
+    )
+
     def __repr__(self):
         return f"<Plan(id={self.id}, name={self.name}, provider={self.provider})>"
 
@@ -63,10 +88,12 @@ class PlanClassification(Base):
     # Relationships
     plan = relationship("Plan", back_populates="classifications")
 
-    # Constraints
+    # Constraints. The (classification, plan_id) index lets the
+    # classification-filtered JOIN in get_plans_by_zip run as an
+    # index-only scan.
     __table_args__ = (
         UniqueConstraint("plan_id", "classification", name="uix_plan_classification"),
-        Index("idx_classification", "classification"),
+        Index("idx_pc_cls_plan", "classification", "plan_id"),
     )
 
     def __repr__(self):
@@ -3,39 +3,105 @@
 Parses EFL PDFs to extract rate structures, tiered pricing, and fees.
 """
 
+import io
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import pypdf
 
+# PyMuPDF extracts text roughly an order of magnitude faster than pypdf;
+# use it when installed and fall back to pypdf otherwise
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
 from .models import RateStructure
 
+# Rates, fees, and plan-type language appear on the first pages of an EFL;
+# trailing pages are legal boilerplate, so skip extracting them entirely.
+MAX_EFL_PAGES = 3
+
+# Combined alternation for every single-valued field so one finditer pass
+# covers the whole document instead of a separate scan per extractor.
+# Each branch carries one named group; matches dispatch on m.lastgroup.
+# Gap quantifiers are bounded ([^$\n]{0,80} instead of .*?) so the engine
+# never backtracks across page boundaries on multi-page PDF text.
+_EFL_SCALAR_RE = re.compile(
+    r"(?P<base_kw>base|monthly|customer)\s+charge[:\s]+\$?(?P<base>[\d.]+)"
+    r"|(?:tdu|tdsp|delivery)[^$\n]{0,80}\$?(?P<tdu>[\d.]+)\s*(?:per\s+kwh|/kwh|¢)"
+    r"|(?P<renewable>\d+)%?\s+renewable"
+    r"|early\s+termination[^$\n]{0,80}\$?(?P<term>[\d.]+)"
+    r"|(?:cancellation|termination)[^$\n]{0,40}fee[^$\n]{0,40}\$?(?P<term2>[\d.]+)"
+    r"|(?P<tou_phrase>time[ -]of[ -]use)"
+    r"|(?P<tou_kw>peak\s+hours|off-peak)"
+    r"|(?P<variable>variable)"
+    r"|(?P<price>price)",
+    re.IGNORECASE,
+)
+
+# "Base charge $9.95" beats a "Monthly charge $4.95" appearing earlier in
+# the text: the single scan finds matches in text order, so keyword rank
+# reproduces the old try-patterns-in-order precedence.
+_BASE_CHARGE_PRIORITY = {"base": 0, "monthly": 1, "customer": 2}
+
 
 class EFLParser:
     """Parser for Electricity Facts Label PDFs."""
 
+    # Tier patterns like "0-500 kWh @ $0.095/kWh" / "501-2000 kWh: $0.085 per kWh",
+    # compiled once at class scope instead of per parse call. Group 3
+    # captures a leading "$" so cents-vs-dollars is decided by the unit
+    # symbol when one is present instead of the >1 magnitude heuristic.
+    # The gap is a lazy bounded class that still admits digits, so a line
+    # like "0-500 kWh (first 500 kWh) @ $0.095/kWh" keeps its range
+    # instead of re-anchoring on the inner number.
+    _TIER_RE = re.compile(
+        r"(\d+)\s*-?\s*(\d+)?\s*kwh[^$¢]{0,60}?(\$)?\s*([\d.]+)\s*(?:per\s+kwh|\/kwh|¢)",
+        re.IGNORECASE,
+    )
+    _FLAT_RATE_RE = re.compile(
+        r"energy\s+charge[:\s]+\$?([\d.]+)\s*(?:per\s+kwh|\/kwh|¢)",
+        re.IGNORECASE,
+    )
+
     def __init__(self, pdf_path: Path):
         """Initialize parser with PDF file path.
 
         Args:
             pdf_path: Path to EFL PDF file
+
+        Raises:
+            FileNotFoundError: If the PDF does not exist (checked before
+                the PDF backend is touched)
         """
-        self.pdf_path = pdf_path
+        self.pdf_path = Path(pdf_path)
+        if not self.pdf_path.exists():
+            raise FileNotFoundError(self.pdf_path)
         self.text = self._extract_text()
 
     def _extract_text(self) -> str:
-        """Extract text from PDF.
+        """Extract text from PDF (PyMuPDF when available, else pypdf).
 
         Returns:
             Extracted text content
         """
         try:
+            if fitz is not None:
+                with fitz.open(self.pdf_path) as doc:
+                    return "\n".join(
+                        page.get_text() for page in doc.pages(0, min(doc.page_count, MAX_EFL_PAGES))
+                    )
             with open(self.pdf_path, "rb") as f:
-                pdf_reader = pypdf.PdfReader(f)
-                text_parts = []
-                for page in pdf_reader.pages:
-                    text_parts.append(page.extract_text())
-                return "\n".join(text_parts)
+                pdf_reader = pypdf.PdfReader(f, strict=False)
+                buf = io.StringIO()
+                for i, page in enumerate(pdf_reader.pages):
+                    if i >= MAX_EFL_PAGES:
+                        break
+                    buf.write(page.extract_text())
+                    buf.write("\n")
+                return buf.getvalue()
         except Exception as e:
             raise ValueError(f"Failed to extract text from PDF: {e}")
 
@@ -50,57 +116,89 @@ class EFLParser:
         """
         try:
             # Extract key components
-            plan_type = self._extract_plan_type()
-            base_charge = self._extract_base_charge()
+            fields = self._scan_scalar_fields()
             tiers = self._extract_rate_tiers()
-            tdu_rate = self._extract_tdu_rate()
-            renewable_pct = self._extract_renewable_percentage()
-            termination_fee = self._extract_termination_fee()
-            has_tou = self._has_time_of_use()
+
+            # Only the literal "time of use" phrase sets the plan type;
+            # peak/off-peak wording alone just flags has_time_of_use, so
+            # a fixed-rate EFL that mentions off-peak hours in passing
+            # keeps its classification
+            has_tou = fields["has_tou"]
+            if fields["has_tou_phrase"]:
+                plan_type = "time_of_use"
+            elif fields["has_variable"] and fields["has_price"]:
+                plan_type = "variable"
+            else:
+                plan_type = "fixed"
 
             return RateStructure(
                 plan_type=plan_type,
-                base_charge=base_charge,
+                base_charge=fields["base_charge"],
                 tiers=tiers,
-                tdu_delivery_rate=tdu_rate,
-                renewable_percentage=renewable_pct,
+                tdu_delivery_rate=fields["tdu_rate"],
+                renewable_percentage=fields["renewable_pct"],
                 has_time_of_use=has_tou,
-                early_termination_fee=termination_fee,
+                early_termination_fee=fields["termination_fee"],
             )
         except Exception as e:
             raise ValueError(f"Failed to parse EFL: {e}")
 
-    def _extract_plan_type(self) -> str:
-        """Determine plan type (fixed, variable, time_of_use)."""
-        text_lower = self.text.lower()
-
-        if "time of use" in text_lower or "time-of-use" in text_lower:
-            return "time_of_use"
-        elif "variable" in text_lower and "price" in text_lower:
-            return "variable"
-        else:
-            return "fixed"
-
-    def _extract_base_charge(self) -> float:
-        """Extract monthly base charge.
+    def _scan_scalar_fields(self) -> Dict[str, Any]:
+        """Extract all single-valued fields in one pass over the text.
 
         Returns:
-            Base charge in dollars
+            Dictionary of extracted field values
         """
-        # Look for patterns like "Base Charge: $9.95" or "Monthly Charge $9.95"
-        patterns = [
-            r"base\s+charge[:\s]+\$?([\d.]+)",
-            r"monthly\s+charge[:\s]+\$?([\d.]+)",
-            r"customer\s+charge[:\s]+\$?([\d.]+)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, self.text, re.IGNORECASE)
-            if match:
-                return float(match.group(1))
-
-        # Default to 0 if not found
-        return 0.0
+        base_charge = None
+        base_rank = len(_BASE_CHARGE_PRIORITY)
+        tdu_rate = None
+        renewable_pct = None
+        termination_fee = None
+        has_tou = False
+        has_tou_phrase = False
+        has_variable = False
+        has_price = False
+
+        for match in _EFL_SCALAR_RE.finditer(self.text):
+            field = match.lastgroup
+            if field == "base":
+                rank = _BASE_CHARGE_PRIORITY[match.group("base_kw").lower()]
+                if rank < base_rank:
+                    base_rank = rank
+                    base_charge = float(match.group("base"))
+            elif field == "tdu":
+                if tdu_rate is None:
+                    rate = float(match.group("tdu"))
+                    # If rate appears to be in cents (> 1), convert to dollars
+                    if rate > 1:
+                        rate = rate / 100
+                    tdu_rate = rate
+            elif field == "renewable":
+                if renewable_pct is None:
+                    renewable_pct = int(match.group("renewable"))
+            elif field in ("term", "term2"):
+                if termination_fee is None:
+                    termination_fee = float(match.group(field))
+            elif field == "tou_phrase":
+                has_tou = True
+                has_tou_phrase = True
+            elif field == "tou_kw":
+                has_tou = True
+            elif field == "variable":
+                has_variable = True
+            elif field == "price":
+                has_price = True
+
+        return {
+            "base_charge": base_charge if base_charge is not None else 0.0,
+            "tdu_rate": tdu_rate,
+            "renewable_pct": renewable_pct,
+            "termination_fee": termination_fee,
+            "has_tou": has_tou,
+            "has_tou_phrase": has_tou_phrase,
+            "has_variable": has_variable,
+            "has_price": has_price,
+        }
 
     def _extract_rate_tiers(self) -> List[Dict[str, Any]]:
         """Extract tiered pricing structure.
@@ -110,21 +208,14 @@ class EFLParser:
         """
         tiers = []
 
-        # Look for patterns like "500 kWh: $0.095 per kWh"
-        # Common patterns in EFLs:
-        # - "0-500 kWh @ $0.095/kWh"
-        # - "501-2000 kWh: $0.085 per kWh"
-        # - "Above 2000 kWh $0.080"
-
-        tier_pattern = r"(\d+)\s*-?\s*(\d+)?\s*kwh.*?\$?([\d.]+)\s*(?:per\s+kwh|\/kwh|¢)"
-
-        for match in re.finditer(tier_pattern, self.text, re.IGNORECASE):
+        for match in self._TIER_RE.finditer(self.text):
             start_kwh = int(match.group(1))
             end_kwh = int(match.group(2)) if match.group(2) else None
-            rate = float(match.group(3))
+            rate = float(match.group(4))
 
-            # If rate appears to be in cents (> 1), convert to dollars
-            if rate > 1:
+            # A "$" prefix means dollars outright; without one, fall back
+            # to the magnitude heuristic (cents if > 1)
+            if match.group(3) is None and rate > 1:
                 rate = rate / 100
 
             tiers.append({
@@ -135,8 +226,7 @@ class EFLParser:
 
         # If no tiers found, look for a single flat rate
         if not tiers:
-            flat_rate_pattern = r"energy\s+charge[:\s]+\$?([\d.]+)\s*(?:per\s+kwh|\/kwh|¢)"
-            match = re.search(flat_rate_pattern, self.text, re.IGNORECASE)
+            match = self._FLAT_RATE_RE.search(self.text)
             if match:
                 rate = float(match.group(1))
                 if rate > 1:
@@ -149,70 +239,6 @@ class EFLParser:
 
         return tiers
 
-    def _extract_tdu_rate(self) -> Optional[float]:
-        """Extract TDU delivery rate.
-
-        Returns:
-            TDU rate per kWh or None
-        """
-        # Look for TDU/TDSP charges
-        patterns = [
-            r"tdu.*?\$?([\d.]+)\s*(?:per\s+kwh|\/kwh|¢)",
-            r"tdsp.*?\$?([\d.]+)\s*(?:per\s+kwh|\/kwh|¢)",
-            r"delivery.*?\$?([\d.]+)\s*(?:per\s+kwh|\/kwh|¢)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, self.text, re.IGNORECASE)
-            if match:
-                rate = float(match.group(1))
-                if rate > 1:
-                    rate = rate / 100
-                return rate
-
-        return None
-
-    def _extract_renewable_percentage(self) -> Optional[int]:
-        """Extract renewable energy percentage.
-
-        Returns:
-            Renewable percentage (0-100) or None
-        """
-        pattern = r"(\d+)%?\s+renewable"
-        match = re.search(pattern, self.text, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-        return None
-
-    def _extract_termination_fee(self) -> Optional[float]:
-        """Extract early termination fee.
-
-        Returns:
-            Termination fee in dollars or None
-        """
-        patterns = [
-            r"early\s+termination.*?\$?([\d.]+)",
-            r"cancellation.*?fee.*?\$?([\d.]+)",
-            r"termination.*?fee.*?\$?([\d.]+)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, self.text, re.IGNORECASE)
-            if match:
-                return float(match.group(1))
-
-        return None
-
-    def _has_time_of_use(self) -> bool:
-        """Check if plan has time-of-use rates.
-
-        Returns:
-            True if time-of-use rates detected
-        """
-        tou_keywords = ["time of use", "time-of-use", "peak hours", "off-peak"]
-        text_lower = self.text.lower()
-        return any(keyword in text_lower for keyword in tou_keywords)
-
 
 def parse_efl_file(pdf_path: Path) -> RateStructure:
     """Parse an EFL PDF file.
@@ -228,3 +254,25 @@ def parse_efl_file(pdf_path: Path) -> RateStructure:
     """
     parser = EFLParser(pdf_path)
     return parser.parse()
+
+
+def parse_efl_files(
+    pdf_paths: List[Path], workers: Optional[int] = None
+) -> List[RateStructure]:
+    """Parse a batch of EFL PDFs in parallel across processes.
+
+    Each parse is CPU-bound (pypdf text decoding plus regex scans) and
+    independent, so a process pool sidesteps the GIL and scales with cores.
+
+    Args:
+        pdf_paths: Paths to EFL PDFs
+        workers: Worker process count (defaults to the CPU count)
+
+    Returns:
+        List of RateStructure objects in input order
+
+    Raises:
+        ValueError: If parsing any file fails
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_efl_file, pdf_paths, chunksize=8))
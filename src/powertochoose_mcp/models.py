@@ -2,10 +2,16 @@
 
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
-class RateTier(BaseModel):
+class _FrozenModel(BaseModel):
+    """Shared config: drop unknown keys, skip setattr validation machinery."""
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class RateTier(_FrozenModel):
     """Rate tier for tiered pricing."""
 
     tier: str = Field(..., description="Tier description (e.g., '0-500', '500+')")
@@ -14,7 +20,7 @@ class RateTier(BaseModel):
     cost: float = Field(..., description="Total cost for this tier in dollars")
 
 
-class CostBreakdown(BaseModel):
+class CostBreakdown(_FrozenModel):
     """Cost breakdown at a specific usage level."""
 
     usage_kwh: int = Field(..., description="Usage level in kWh")
@@ -27,7 +33,7 @@ class CostBreakdown(BaseModel):
     breakdown_by_tier: List[RateTier] = Field(default_factory=list, description="Tier-by-tier breakdown")
 
 
-class RateStructure(BaseModel):
+class RateStructure(_FrozenModel):
     """Electricity rate structure parsed from EFL."""
 
     plan_type: str = Field(..., description="Plan type (fixed, variable, time_of_use)")
@@ -39,7 +45,7 @@ class RateStructure(BaseModel):
     early_termination_fee: Optional[float] = Field(None, description="Early termination fee")
 
 
-class PlanData(BaseModel):
+class PlanData(_FrozenModel):
     """Complete plan data model."""
 
     id: str = Field(..., description="Unique plan identifier")
@@ -70,7 +76,7 @@ class PlanData(BaseModel):
         return v
 
 
-class SearchParams(BaseModel):
+class SearchParams(_FrozenModel):
     """Parameters for search_plans tool."""
 
     zip_code: str = Field(..., description="5-digit ZIP code")
@@ -86,13 +92,13 @@ class SearchParams(BaseModel):
         return v
 
 
-class CalculateParams(BaseModel):
+class CalculateParams(_FrozenModel):
     """Parameters for calculate_plan_cost tool."""
 
     plan_id: str = Field(..., description="Plan identifier")
 
 
-class PlanSummary(BaseModel):
+class PlanSummary(_FrozenModel):
     """Summary of a plan for search results."""
 
     id: str
@@ -106,7 +112,7 @@ class PlanSummary(BaseModel):
     scraped_at: datetime
 
 
-class PlanCostDetail(BaseModel):
+class PlanCostDetail(_FrozenModel):
     """Detailed cost information for a plan."""
 
     plan_id: str
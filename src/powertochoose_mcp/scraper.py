@@ -5,39 +5,107 @@ Scrapes electricity plan listings, downloads EFL PDFs, and extracts plan details
 
 import asyncio
 import hashlib
+import logging
+import os
+import re
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional
+import aiofiles
 import httpx
 from bs4 import BeautifulSoup
+from sqlalchemy import select
 
 from .config import (
     POWERTOCHOOSE_BASE_URL,
     REQUEST_DELAY_SECONDS,
     REQUEST_TIMEOUT_SECONDS,
     EFL_DIR,
-    ZIP_CODES,
+    BUCKET_ZIPS,
     EFL_RETENTION_DAYS,
     LOG_RETENTION_DAYS,
 )
-from .db import get_session, store_plan, init_database
+from .db import Plan, get_cached_plan, get_session, get_read_session, store_plan, init_database
 from .efl_parser import parse_efl_file
-from .calculator import calculate_plan_costs
-from .utils.logging import cleanup_old_log_files
+from .calculator import calculate_plan_costs, summarize_rate_structure
+from .utils.logging import cleanup_old_log_files, setup_queue_logging
+
+log = logging.getLogger(__name__)
+
+# Helper patterns compiled once; these run per plan across thousands of
+# plans per scrape
+_RE_RENEWABLE = re.compile(r"(\d+)%?\s*renewable", re.IGNORECASE)
+_RE_MONEY = re.compile(r"\$(\d+(?:\.\d+)?)")
+_RE_MONTHS = re.compile(r"(\d+)")
+
+# Plans in the same provider family usually share one rate structure, so
+# the Pydantic model_dump reflection and summary formatting run once per
+# unique structure per process. Keyed the same way as the cost cache in
+# calculator.py since RateStructure's tiers make the model unhashable.
+_rs_dump_cache: dict = {}
+
+
+def _dump_rate_structure(rate_structure) -> tuple[dict, str]:
+    """Return (dict form, summary string) for a rate structure, memoized.
+
+    Args:
+        rate_structure: RateStructure model or plain dict fallback
+
+    Returns:
+        Tuple of the dumped dict and its one-line summary
+    """
+    if not hasattr(rate_structure, "model_dump"):
+        return rate_structure, summarize_rate_structure(rate_structure)
+
+    key = (
+        rate_structure.plan_type,
+        rate_structure.base_charge,
+        rate_structure.tdu_delivery_rate,
+        rate_structure.renewable_percentage,
+        rate_structure.has_time_of_use,
+        rate_structure.early_termination_fee,
+        tuple(
+            (t["start_kwh"], t.get("end_kwh"), t["rate_per_kwh"])
+            for t in rate_structure.tiers
+        ),
+    )
+    cached = _rs_dump_cache.get(key)
+    if cached is None:
+        rs_dict = rate_structure.model_dump()
+        cached = (rs_dict, summarize_rate_structure(rs_dict))
+        _rs_dump_cache[key] = cached
+    return cached
 
 
 class PowerToChooseScraper:
     """Scraper for powertochoose.org electricity plans."""
 
-    def __init__(self):
-        """Initialize scraper."""
-        self.client = httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS)
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """Initialize scraper.
+
+        Args:
+            client: Optional shared HTTP client; when callers pass one it
+                is reused across scrapers so the keep-alive pool amortizes
+                TCP/TLS handshakes over every API call and EFL download,
+                and close() leaves it open for the owner.
+        """
+        self.client = client or httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        self._owns_client = client is None
         self.base_url = POWERTOCHOOSE_BASE_URL
+        # Bounds concurrent plan processing (EFL download + parse) across
+        # all ZIPs sharing this scraper; politeness delay happens inside
+        # the slot so the hosts never see more than 8 in-flight requests
+        self._plan_semaphore = asyncio.Semaphore(8)
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close HTTP client (only if this scraper created it)."""
+        if self._owns_client:
+            await self.client.aclose()
 
     async def scrape_zip_code(self, zip_code: str) -> int:
         """Scrape all plans for a ZIP code using PowerToChoose API.
@@ -48,7 +116,7 @@ class PowerToChooseScraper:
         Returns:
             Number of plans successfully scraped
         """
-        print(f"Scraping ZIP code: {zip_code}")
+        log.info("Scraping ZIP code: %s", zip_code)
 
         try:
             # Use PowerToChoose API
@@ -63,47 +131,80 @@ class PowerToChooseScraper:
             plans = data.get("data", [])
             
             if not plans:
-                print(f"  ⚠ No plans found for ZIP {zip_code}")
+                log.warning("No plans found for ZIP %s", zip_code)
                 return 0
 
-            print(f"  Found {len(plans)} plans from API")
+            log.info("Found %d plans from API for ZIP %s", len(plans), zip_code)
 
-            successful_count = 0
-            
-            for plan in plans:
-                try:
-                    plan_data = await self._extract_plan_data_from_api(plan, zip_code)
-                    if plan_data:
-                        successful_count += 1
-                        print(f"  ✓ Scraped: {plan_data['name']}")
-                    
-                    # Respect rate limits (lighter since we're using API)
-                    await asyncio.sleep(REQUEST_DELAY_SECONDS / 2)
-                    
-                except Exception as e:
-                    print(f"  ✗ Error processing plan {plan.get('plan_name', 'unknown')}: {e}")
-                    continue
-
-            print(f"Successfully scraped {successful_count} plans for ZIP {zip_code}")
+            batch_time = datetime.utcnow()  # one scraped_at for the whole batch
+
+            # Overlap EFL downloads; the shared semaphore bounds in-flight
+            # requests so politeness survives the concurrency. One session
+            # wraps the whole ZIP so all plans commit in a single
+            # transaction (one fsync) instead of one per plan.
+            with get_session() as session:
+                results = await asyncio.gather(
+                    *(
+                        self._process_plan(plan, zip_code, batch_time, session)
+                        for plan in plans
+                    ),
+                    return_exceptions=True,
+                )
+            successful_count = sum(
+                1 for r in results if r is not None and not isinstance(r, BaseException)
+            )
+
+            log.info("Successfully scraped %d plans for ZIP %s", successful_count, zip_code)
             return successful_count
 
         except Exception as e:
-            print(f"Error scraping ZIP code {zip_code}: {e}")
+            log.error("Error scraping ZIP code %s: %s", zip_code, e)
             return 0
 
-            print(f"Successfully scraped {successful_count} plans for ZIP {zip_code}")
-            return successful_count
+    async def _process_plan(
+        self, plan: dict, zip_code: str, batch_time: datetime, session
+    ) -> Optional[dict]:
+        """Process one plan under the concurrency semaphore.
 
-        except Exception as e:
-            print(f"Error scraping ZIP code {zip_code}: {e}")
-            return 0
+        Args:
+            plan: Plan dictionary from API
+            zip_code: ZIP code being scraped
+            batch_time: Shared scraped_at timestamp for the current batch
+            session: Shared per-ZIP database session
 
-    async def _extract_plan_data_from_api(self, plan: dict, zip_code: str) -> Optional[dict]:
+        Returns:
+            Plan data dictionary or None on failure
+        """
+        async with self._plan_semaphore:
+            try:
+                plan_data = await self._extract_plan_data_from_api(
+                    plan, zip_code, batch_time, session
+                )
+                if plan_data:
+                    # Lazy %s so the format cost vanishes when debug is off
+                    log.debug("Scraped: %s", plan_data["name"])
+                # Respect rate limits (lighter since we're using API)
+                await asyncio.sleep(REQUEST_DELAY_SECONDS / 2)
+                return plan_data
+            except Exception as e:
+                log.error("Error processing plan %s: %s", plan.get("plan_name", "unknown"), e)
+                return None
+
+    async def _extract_plan_data_from_api(
+        self,
+        plan: dict,
+        zip_code: str,
+        batch_time: Optional[datetime] = None,
+        session=None,
+    ) -> Optional[dict]:
         """Extract plan data from API response.
 
         Args:
             plan: Plan dictionary from API
             zip_code: ZIP code being scraped
+            batch_time: Shared scraped_at timestamp for the current batch
+            session: Shared per-ZIP session; a short-lived one is opened
+                when not provided
 
         Returns:
             Plan data dictionary or None if extraction fails
@@ -121,19 +222,32 @@ class PowerToChooseScraper:
             # Get EFL URL
             efl_url = plan.get("fact_sheet", "")
             if not efl_url:
-                print(f"  ⚠ No EFL found for {plan_name}")
+                log.debug("No EFL found for %s", plan_name)
                 return None
 
-            # Download and parse EFL for detailed rate structure
-            efl_path = await self._download_efl(efl_url, plan_id)
+            # Download and parse EFL for detailed rate structure; reuse
+            # the stored ETag so unchanged PDFs come back as 304s
+            if session is not None:
+                prior_etag = session.execute(
+                    select(Plan.efl_etag).where(Plan.id == plan_id)
+                ).scalar_one_or_none()
+            else:
+                with get_read_session() as read_session:
+                    prior_etag = read_session.execute(
+                        select(Plan.efl_etag).where(Plan.id == plan_id)
+                    ).scalar_one_or_none()
+            efl_path, efl_etag = await self._download_efl(efl_url, plan_id, prior_etag)
             if not efl_path:
                 # If EFL parsing fails, use API data as fallback
-                print(f"  ⚠ Could not parse EFL, using API data for {plan_name}")
+                log.debug("Could not parse EFL, using API data for %s", plan_name)
                 rate_structure = self._create_rate_structure_from_api(plan)
                 costs = self._calculate_costs_from_api(plan)
             else:
-                rate_structure = parse_efl_file(efl_path)
-                costs = calculate_plan_costs(rate_structure)
+                # PDF parsing is CPU-bound; running it on a worker thread
+                # lets other plans' downloads overlap instead of stalling
+                # the event loop for the duration of the parse
+                rate_structure = await asyncio.to_thread(parse_efl_file, efl_path)
+                costs = await asyncio.to_thread(calculate_plan_costs, rate_structure)
 
             # Extract contract length
             contract_length = plan.get("term_value")
@@ -149,7 +263,9 @@ class PowerToChooseScraper:
             # Extract classifications
             classifications = self._extract_classifications_from_api(plan, rate_structure)
 
-            # Build plan data
+            # Build plan data; the summary string is computed once here
+            # so reads never re-derive it
+            rs_dict, rs_summary = _dump_rate_structure(rate_structure)
             plan_data = {
                 "id": plan_id,
                 "name": plan_name,
@@ -158,51 +274,77 @@ class PowerToChooseScraper:
                 "contract_length_months": contract_length,
                 "renewable_percentage": renewable_pct,
                 "cancellation_fee": cancellation_fee,
-                "rate_structure": rate_structure.model_dump() if hasattr(rate_structure, 'model_dump') else rate_structure,
+                "rate_structure": rs_dict,
+                "rate_structure_summary": rs_summary,
                 "cost_500_kwh": costs["cost_500_kwh"],
                 "cost_1000_kwh": costs["cost_1000_kwh"],
                 "cost_2000_kwh": costs["cost_2000_kwh"],
                 "efl_url": efl_url,
+                "efl_etag": efl_etag,
                 "plan_url": plan.get("go_to_plan", ""),
                 "efl_parsed": efl_path is not None,
             }
 
-            # Store in database
-            with get_session() as session:
-                store_plan(session, plan_data, classifications)
+            # Store in database. A savepoint isolates this plan so one
+            # bad row rolls back alone while the ZIP's transaction lives on.
+            if session is not None:
+                with session.begin_nested():
+                    store_plan(session, plan_data, classifications, now=batch_time)
+            else:
+                with get_session() as own_session:
+                    store_plan(own_session, plan_data, classifications, now=batch_time)
 
             return plan_data
 
         except Exception as e:
-            print(f"  ✗ Error extracting plan data: {e}")
+            log.error("Error extracting plan data: %s", e)
             return None
 
-    async def _download_efl(self, efl_url: str, plan_id: str) -> Optional[Path]:
-        """Download EFL PDF.
+    async def _download_efl(
+        self, efl_url: str, plan_id: str, prior_etag: Optional[str] = None
+    ) -> tuple[Optional[Path], Optional[str]]:
+        """Download EFL PDF, skipping the transfer when it hasn't changed.
 
         Args:
             efl_url: URL to EFL PDF
             plan_id: Plan identifier
+            prior_etag: ETag from the last successful download, if known
 
         Returns:
-            Path to downloaded PDF or None if download fails
+            Tuple of (path to PDF or None, ETag or None). On HTTP 304 the
+            path is the newest previously downloaded copy on disk.
         """
         try:
-            response = await self.client.get(efl_url)
-            response.raise_for_status()
+            # Conditional GET: if we still have the prior copy on disk and
+            # an ETag, a 304 avoids both the transfer and the re-parse
+            existing = max(
+                EFL_DIR.glob(f"{plan_id}_*.pdf"),
+                key=lambda p: p.stat().st_mtime,
+                default=None,
+            )
+            headers = {}
+            if prior_etag and existing is not None:
+                headers["If-None-Match"] = prior_etag
 
-            # Save PDF
             pdf_filename = f"{plan_id}_{datetime.now().strftime('%Y%m%d')}.pdf"
             pdf_path = EFL_DIR / pdf_filename
 
-            with open(pdf_path, "wb") as f:
-                f.write(response.content)
+            # Stream straight to disk so concurrent downloads never hold
+            # whole PDFs in memory and writes don't block the event loop
+            async with self.client.stream("GET", efl_url, headers=headers) as response:
+                if response.status_code == 304:
+                    return existing, prior_etag
+                response.raise_for_status()
+                async with aiofiles.open(pdf_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(65536):
+                        await f.write(chunk)
+                etag = response.headers.get("ETag")
 
-            return pdf_path
+            return pdf_path, etag
 
         except Exception as e:
-            print(f"  ✗ Error downloading EFL: {e}")
-            return None
+            log.error("Error downloading EFL %s: %s", efl_url, e)
+            return None, None
 
     def _generate_plan_id(self, provider: str, plan_name: str, zip_code: str) -> str:
         """Generate unique plan ID.
@@ -215,9 +357,11 @@ class PowerToChooseScraper:
         Returns:
             Unique plan identifier
         """
-        # Create hash of provider + plan name + zip
+        # Create hash of provider + plan name + zip. sha256 gets the
+        # SHA-NI hardware path on x86_64, unlike md5; same 16-hex-char ID
+        # shape as before
         content = f"{provider}_{plan_name}_{zip_code}".lower()
-        return hashlib.md5(content.encode()).hexdigest()[:16]
+        return hashlib.sha256(content.encode()).hexdigest()[:16]
 
     def _extract_contract_length(self, plan_card) -> Optional[int]:
         """Extract contract length in months.
@@ -228,19 +372,14 @@ class PowerToChooseScraper:
         Returns:
             Contract length in months or None
         """
-        try:
-            # Look for contract length text (adjust selector)
-            contract_text = plan_card.select_one(".contract-length")
-            if contract_text:
-                text = contract_text.text.lower()
-                if "month" in text:
-                    # Extract number
-                    import re
-                    match = re.search(r"(\d+)", text)
-                    if match:
-                        return int(match.group(1))
-        except:
-            pass
+        # Look for contract length text (adjust selector)
+        contract_text = plan_card.select_one(".contract-length")
+        if contract_text:
+            text = contract_text.text.lower()
+            if "month" in text:
+                match = _RE_MONTHS.search(text)
+                if match:
+                    return int(match.group(1))
         return None
 
     def _extract_renewable_percentage(self, renewable_desc: str) -> Optional[int]:
@@ -252,13 +391,11 @@ class PowerToChooseScraper:
         Returns:
             Renewable percentage or None
         """
-        try:
-            import re
-            match = re.search(r"(\d+)%?\s*renewable", renewable_desc, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
-        except:
-            pass
+        if not renewable_desc:
+            return None
+        match = _RE_RENEWABLE.search(renewable_desc)
+        if match:
+            return int(match.group(1))
         return None
 
     def _extract_cancellation_fee(self, pricing_details: str) -> Optional[float]:
@@ -270,14 +407,12 @@ class PowerToChooseScraper:
         Returns:
             Cancellation fee or None
         """
-        try:
-            import re
-            # Look for patterns like "$150.00" or "$150"
-            match = re.search(r"\$(\d+(?:\.\d+)?)", pricing_details)
-            if match:
-                return float(match.group(1))
-        except:
-            pass
+        if not pricing_details:
+            return None
+        # Look for patterns like "$150.00" or "$150"
+        match = _RE_MONEY.search(pricing_details)
+        if match:
+            return float(match.group(1))
         return None
 
     def _create_rate_structure_from_api(self, plan: dict) -> dict:
@@ -443,54 +578,70 @@ class PowerToChooseScraper:
 
 def cleanup_old_files():
     """Clean up old EFL PDFs and log files."""
-    print("Cleaning up old files...")
+    log.info("Cleaning up old files...")
 
     # Clean up EFL PDFs older than retention period
     cutoff_date = datetime.now() - timedelta(days=EFL_RETENTION_DAYS)
     cutoff_timestamp = cutoff_date.timestamp()
 
+    # scandir's DirEntry caches stat data from the directory read, so this
+    # is one syscall per entry instead of two
     removed_efls = 0
-    for pdf_file in EFL_DIR.glob("*.pdf"):
-        if pdf_file.stat().st_mtime < cutoff_timestamp:
-            pdf_file.unlink()
-            removed_efls += 1
+    with os.scandir(EFL_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".pdf") and entry.stat().st_mtime < cutoff_timestamp:
+                os.unlink(entry.path)
+                removed_efls += 1
 
-    print(f"  Removed {removed_efls} old EFL PDFs")
+    log.info("Removed %d old EFL PDFs", removed_efls)
 
     # Clean up old log files
     cleanup_old_log_files(LOG_RETENTION_DAYS)
-    print(f"  Cleaned up log files older than {LOG_RETENTION_DAYS} days")
+    log.info("Cleaned up log files older than %d days", LOG_RETENTION_DAYS)
 
 
-async def scrape_bucket(bucket_id: int) -> int:
+async def scrape_bucket(
+    bucket_id: int, scraper: Optional[PowerToChooseScraper] = None
+) -> int:
     """Scrape all ZIP codes in a bucket.
 
     Args:
         bucket_id: Bucket ID (0-6 for days of week)
+        scraper: Optional scraper to reuse so multi-bucket runs share one
+            connection pool
 
     Returns:
         Total number of plans scraped
     """
     # Determine which ZIP codes belong to this bucket
-    bucket_zips = [z for z in ZIP_CODES if int(z) % 7 == bucket_id]
+    bucket_zips = BUCKET_ZIPS[bucket_id]
 
-    print(f"\n=== Scraping Bucket {bucket_id} ===")
-    print(f"ZIP codes: {', '.join(bucket_zips)}\n")
+    log.info("=== Scraping Bucket %d === (ZIP codes: %s)", bucket_id, ", ".join(bucket_zips))
 
-    scraper = PowerToChooseScraper()
+    own_scraper = scraper is None
+    if own_scraper:
+        scraper = PowerToChooseScraper()
     total_plans = 0
 
     try:
+        # ZIPs run one at a time: each holds a write transaction open for
+        # its whole run, and SQLite has a single writer, so a second
+        # concurrent ZIP would busy-wait on the writer lock inside the
+        # busy_timeout pragma — synchronously, stalling the event loop
+        # (including the ZIP holding the lock) and then dropping its
+        # plans on timeout. Downloads still overlap plenty: the per-plan
+        # gather inside scrape_zip_code keeps the semaphore saturated.
         for zip_code in bucket_zips:
-            count = await scraper.scrape_zip_code(zip_code)
-            total_plans += count
-            await asyncio.sleep(REQUEST_DELAY_SECONDS * 2)  # Extra delay between ZIP codes
+            try:
+                total_plans += await scraper.scrape_zip_code(zip_code)
+            except Exception as e:
+                log.error("Error scraping ZIP code %s: %s", zip_code, e)
 
     finally:
-        await scraper.close()
+        if own_scraper:
+            await scraper.close()
 
-    print(f"\n=== Bucket {bucket_id} Complete ===")
-    print(f"Total plans scraped: {total_plans}\n")
+    log.info("=== Bucket %d Complete === %d plans scraped", bucket_id, total_plans)
 
     return total_plans
 
@@ -501,13 +652,13 @@ async def scrape_today():
     cleanup_old_files()
 
     # Determine today's bucket (0=Sunday, 6=Saturday)
-    bucket_id = datetime.now().weekday()
-    if bucket_id == 6:  # Adjust Sunday from 6 to 0
-        bucket_id = 0
-    else:
-        bucket_id += 1
+    bucket_id = datetime.now().isoweekday() % 7
 
-    return await scrape_bucket(bucket_id)
+    try:
+        return await scrape_bucket(bucket_id)
+    finally:
+        # Drop cached plan reads so tools see the fresh rows immediately
+        get_cached_plan.cache_clear()
 
 
 async def scrape_all():
@@ -515,13 +666,19 @@ async def scrape_all():
     # Cleanup old data first
     cleanup_old_files()
 
+    # One scraper (and connection pool) shared across all buckets
+    scraper = PowerToChooseScraper()
     total_plans = 0
-    for bucket_id in range(7):
-        count = await scrape_bucket(bucket_id)
-        total_plans += count
+    try:
+        for bucket_id in range(7):
+            count = await scrape_bucket(bucket_id, scraper=scraper)
+            total_plans += count
+    finally:
+        await scraper.close()
+        # Drop cached plan reads so tools see the fresh rows immediately
+        get_cached_plan.cache_clear()
 
-    print(f"\n=== All Buckets Complete ===")
-    print(f"Total plans scraped: {total_plans}\n")
+    log.info("=== All Buckets Complete === %d plans scraped", total_plans)
 
     return total_plans
 
@@ -530,6 +687,9 @@ def main():
     """CLI entry point for scraper."""
     import sys
 
+    # Non-blocking logging; handlers run on the listener thread
+    setup_queue_logging()
+
     # Initialize database
     init_database()
 
@@ -3,11 +3,12 @@
 Exposes search_plans and calculate_plan_cost tools to LLMs via Model Context Protocol.
 """
 
-import json
 import sys
 from typing import List, Dict, Any
 from datetime import datetime
 
+import orjson
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.server.sse import SseServerTransport
@@ -17,9 +18,15 @@ from starlette.routing import Route, Mount
 from starlette.requests import Request
 from starlette.responses import Response
 
-from .db import get_session, get_plans_by_zip, get_plan_by_id, log_request
-from .models import SearchParams, CalculateParams, PlanSummary, PlanCostDetail, CostBreakdown
+from .db import (
+    get_session,
+    get_plan_summaries_by_zip,
+    get_cached_plan,
+    log_request,
+)
+from .models import SearchParams, CalculateParams, PlanCostDetail, CostBreakdown
 from .config import ZIP_CODES
+from .calculator import summarize_rate_structure as _summarize_rate_structure
 from .utils.logging import log_request_to_jsonl
 
 
@@ -84,58 +91,56 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         raise ValueError(f"Unknown tool: {name}")
 
 
-async def search_plans_tool(arguments: Dict[str, Any]) -> List[TextContent]:
-    """Search electricity plans by ZIP code.
+async def _search_plans_impl(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Search electricity plans by ZIP code, returning plain data.
+
+    Split from the tool wrapper so in-process callers (tests, other
+    tools) get the dict without a serialize/parse round trip.
 
     Args:
         arguments: Tool arguments
 
     Returns:
-        List of TextContent with search results
+        Result dict; has a "plans" key on success
     """
     # Validate parameters
     params = SearchParams(**arguments)
 
     # Check if ZIP code is supported
     if params.zip_code not in ZIP_CODES:
-        result = {
+        return {
             "message": "Service coming to your ZIP code soon!",
             "supported_zip_codes": ZIP_CODES,
         }
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
     # Query database
     with get_session() as session:
-        plans = get_plans_by_zip(
+        plans = get_plan_summaries_by_zip(
             session,
             params.zip_code,
             classifications=params.classifications,
-            only_complete=True,
+            limit=params.max_results,
         )
 
-        # Limit results if requested
-        if params.max_results:
-            plans = plans[:params.max_results]
-
-        # Convert to summaries
-        summaries = []
-        for plan in plans:
-            # Get classifications
-            classifications = [c.classification for c in plan.classifications]
-
-            # Create summary
-            summary = PlanSummary(
-                id=plan.id,
-                name=plan.name,
-                provider=plan.provider,
-                contract_length_months=plan.contract_length_months,
-                renewable_percentage=plan.renewable_percentage,
-                classifications=classifications,
-                cost_at_1000_kwh=plan.cost_1000_kwh["total_monthly_usd"],
-                rate_structure_summary=_summarize_rate_structure(plan.rate_structure),
-                scraped_at=plan.scraped_at,
-            )
-            summaries.append(summary.model_dump(mode="json"))
+        # Convert to summaries. The rows come straight from our own
+        # database, so build the dicts directly instead of paying a
+        # PlanSummary validation plus model_dump per plan; the model still
+        # documents the shape and serves any caller that wants validation.
+        summaries = [
+            {
+                "id": plan.id,
+                "name": plan.name,
+                "provider": plan.provider,
+                "contract_length_months": plan.contract_length_months,
+                "renewable_percentage": plan.renewable_percentage,
+                "classifications": [c.classification for c in plan.classifications],
+                "cost_at_1000_kwh": plan.cost_1000_kwh["total_monthly_usd"],
+                "rate_structure_summary": plan.rate_structure_summary
+                or _summarize_rate_structure(plan.rate_structure),
+                "scraped_at": plan.scraped_at.isoformat(),
+            }
+            for plan in plans
+        ]
 
         # Log request
         log_request(session, "search_plans", arguments, len(summaries))
@@ -143,80 +148,88 @@ async def search_plans_tool(arguments: Dict[str, Any]) -> List[TextContent]:
     # Also log to JSONL
     log_request_to_jsonl("search_plans", arguments, len(summaries))
 
-    result = {
+    return {
         "zip_code": params.zip_code,
         "total_results": len(summaries),
         "plans": summaries,
     }
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
+async def search_plans_tool(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Search electricity plans by ZIP code.
 
-async def calculate_plan_cost_tool(arguments: Dict[str, Any]) -> List[TextContent]:
-    """Calculate detailed cost breakdown for a plan.
+    Args:
+        arguments: Tool arguments
+
+    Returns:
+        List of TextContent with search results
+    """
+    result = await _search_plans_impl(arguments)
+    if "plans" not in result:
+        return [TextContent(type="text", text=orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())]
+
+    # Stream the result as one content chunk per plan (header first) so
+    # the transport can flush early chunks while later ones serialize,
+    # instead of building one multi-MB document up front
+    header = {"zip_code": result["zip_code"], "total_results": result["total_results"]}
+    return [TextContent(type="text", text=orjson.dumps(header).decode())] + [
+        TextContent(type="text", text=orjson.dumps(summary).decode())
+        for summary in result["plans"]
+    ]
+
+
+async def _calculate_plan_cost_impl(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate a plan's cost breakdown, returning plain data.
 
     Args:
         arguments: Tool arguments
 
     Returns:
-        List of TextContent with cost details
+        Cost detail dict, or a dict with an "error" key
     """
     # Validate parameters
     params = CalculateParams(**arguments)
 
-    # Query database
-    with get_session() as session:
-        plan = get_plan_by_id(session, params.plan_id)
-
-        if not plan:
-            result = {"error": f"Plan not found: {params.plan_id}"}
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-
-        # Build detailed cost response
-        detail = PlanCostDetail(
-            plan_id=plan.id,
-            plan_name=plan.name,
-            provider=plan.provider,
-            cost_500_kwh=CostBreakdown(**plan.cost_500_kwh),
-            cost_1000_kwh=CostBreakdown(**plan.cost_1000_kwh),
-            cost_2000_kwh=CostBreakdown(**plan.cost_2000_kwh),
-            rate_structure=plan.rate_structure,
-            scraped_at=plan.scraped_at,
-        )
-
-        # Log request
-        log_request(session, "calculate_plan_cost", arguments, 1)
+    # Cached read: repeat lookups of the same plan between scrapes skip
+    # the session and query entirely (store_plan invalidates on write,
+    # and entries age out with the cache's TTL window)
+    plan = get_cached_plan(params.plan_id)
+
+    if not plan:
+        return {"error": f"Plan not found: {params.plan_id}"}
+
+    # Build detailed cost response
+    detail = PlanCostDetail(
+        plan_id=plan.id,
+        plan_name=plan.name,
+        provider=plan.provider,
+        cost_500_kwh=CostBreakdown(**plan.cost_500_kwh),
+        cost_1000_kwh=CostBreakdown(**plan.cost_1000_kwh),
+        cost_2000_kwh=CostBreakdown(**plan.cost_2000_kwh),
+        rate_structure=plan.rate_structure,
+        scraped_at=plan.scraped_at,
+    )
+
+    # Log request (buffered; no session round-trip needed)
+    log_request(None, "calculate_plan_cost", arguments, 1)
 
     # Also log to JSONL
     log_request_to_jsonl("calculate_plan_cost", arguments, 1)
 
-    return [TextContent(type="text", text=json.dumps(detail.model_dump(mode="json"), indent=2))]
+    return detail.model_dump(mode="json")
 
 
-def _summarize_rate_structure(rate_structure: Dict[str, Any]) -> str:
-    """Create a human-readable summary of rate structure.
+async def calculate_plan_cost_tool(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Calculate detailed cost breakdown for a plan.
 
     Args:
-        rate_structure: Rate structure dictionary
+        arguments: Tool arguments
 
     Returns:
-        Summary string
+        List of TextContent with cost details
     """
-    plan_type = rate_structure.get("plan_type", "fixed")
-    base_charge = rate_structure.get("base_charge", 0)
-    tiers = rate_structure.get("tiers", [])
-
-    summary_parts = [f"{plan_type.replace('_', ' ').title()} rate"]
-
-    if base_charge > 0:
-        summary_parts.append(f"${base_charge:.2f} base charge")
-
-    if tiers:
-        # Show first tier rate
-        first_tier_rate = tiers[0].get("rate_per_kwh", 0)
-        summary_parts.append(f"from ${first_tier_rate:.4f}/kWh")
-
-    return ", ".join(summary_parts)
+    result = await _calculate_plan_cost_impl(arguments)
+    return [TextContent(type="text", text=orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())]
 
 
 async def main(mode="stdio", port=8080):
@@ -248,7 +261,7 @@ async def main(mode="stdio", port=8080):
                     app.create_initialization_options(),
                 )
             # Return empty response to avoid NoneType error
-            return Response()
+            return Response(status_code=204)
         
         starlette_app = Starlette(
             routes=[
@@ -260,11 +273,17 @@ async def main(mode="stdio", port=8080):
         print(f"PowerToChoose MCP Server starting on http://localhost:{port}/sse", file=sys.stderr)
         print(f"Database: {init_database.__module__}", file=sys.stderr)
         
+        # uvloop and httptools cut per-request overhead when installed;
+        # uvicorn's "auto" picks them up and falls back cleanly when not.
+        # Access logs stringify every request, so keep them off.
         config = uvicorn.Config(
             starlette_app,
             host="127.0.0.1",
             port=port,
-            log_level="info"
+            log_level="warning",
+            loop="auto",
+            http="auto",
+            access_log=False,
         )
         server = uvicorn.Server(config)
         await server.serve()
@@ -1,36 +1,133 @@
 """Request logging utilities."""
 
-import json
-from datetime import datetime
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any
 
+import orjson
+
 from ..config import LOG_DIR
 
+_queue_listener: "logging.handlers.QueueListener | None" = None
+
+
+def setup_queue_logging(level: int = logging.INFO):
+    """Route stdlib logging through a queue so emit() never blocks.
+
+    Handlers do their formatting and stream writes on the listener thread,
+    so log calls on the event loop are a single lock-free queue put. Safe
+    to call more than once; only the first call installs the listener.
+
+    Args:
+        level: Root logger level (records below it are dropped before
+            formatting, so gated debug logs cost almost nothing)
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
+
+# JSONL logging is non-critical, so entries are buffered in memory and a
+# background thread appends them in one open/write per interval instead of
+# an open+write+close syscall round trip inside every tool call. deque
+# append/popleft are atomic in CPython, so producers need no lock.
+_jsonl_buffer: deque = deque(maxlen=10000)
+_FLUSH_INTERVAL_SECONDS = 1.0
+_flusher_started = False
+_flusher_lock = threading.Lock()
+
+# Current day's log path, rebuilt only on day rollover so flushes skip
+# the strftime + Path construction
+_current_date: "str | None" = None
+_current_log_path: "Path | None" = None
+
+
+def _log_path_for_today() -> Path:
+    global _current_date, _current_log_path
+    today = time.strftime("%Y-%m-%d", time.gmtime())
+    if today != _current_date:
+        _current_date = today
+        _current_log_path = LOG_DIR / f"requests_{today}.jsonl"
+    return _current_log_path
+
+
+def flush_jsonl_logs():
+    """Write buffered entries to the current day's JSONL file."""
+    batch = []
+    while _jsonl_buffer:
+        try:
+            batch.append(_jsonl_buffer.popleft())
+        except IndexError:
+            break
+    if batch:
+        with open(_log_path_for_today(), "ab") as f:
+            f.write(b"\n".join(orjson.dumps(entry) for entry in batch) + b"\n")
+
+
+def _flusher_loop():
+    while True:
+        time.sleep(_FLUSH_INTERVAL_SECONDS)
+        try:
+            flush_jsonl_logs()
+        except Exception:
+            # Logging must never take down the flusher; entries stay
+            # buffered and the next tick retries
+            pass
+
+
+def _ensure_flusher():
+    global _flusher_started
+    if _flusher_started:
+        return
+    with _flusher_lock:
+        if not _flusher_started:
+            threading.Thread(target=_flusher_loop, daemon=True).start()
+            atexit.register(flush_jsonl_logs)
+            _flusher_started = True
+
 
 def log_request_to_jsonl(tool_name: str, parameters: Dict[str, Any], result_count: int):
-    """Log an MCP request to JSONL file.
+    """Buffer an MCP request log entry for the JSONL file.
+
+    Entries are written by a background thread (or atexit); call
+    flush_jsonl_logs() to force them to disk immediately.
 
     Args:
         tool_name: Name of the MCP tool
         parameters: Tool parameters
         result_count: Number of results returned
     """
-    # Create log entry
-    log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "tool_name": tool_name,
-        "parameters": parameters,
-        "result_count": result_count,
-        "classifications_used": parameters.get("classifications"),
-    }
-
-    # Determine log file (one file per day)
-    log_file = LOG_DIR / f"requests_{datetime.utcnow().strftime('%Y-%m-%d')}.jsonl"
-
-    # Append to JSONL file
-    with open(log_file, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+    _ensure_flusher()
+    _jsonl_buffer.append(
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "tool_name": tool_name,
+            "parameters": parameters,
+            "result_count": result_count,
+            "classifications_used": parameters.get("classifications"),
+        }
+    )
 
 
 def cleanup_old_log_files(retention_days: int):
@@ -39,8 +136,13 @@ def cleanup_old_log_files(retention_days: int):
     Args:
         retention_days: Number of days to retain logs
     """
-    cutoff_date = datetime.utcnow().timestamp() - (retention_days * 86400)
+    cutoff_date = time.time() - (retention_days * 86400)
 
-    for log_file in LOG_DIR.glob("requests_*.jsonl"):
-        if log_file.stat().st_mtime < cutoff_date:
-            log_file.unlink()
+    with os.scandir(LOG_DIR) as entries:
+        for entry in entries:
+            if (
+                entry.name.startswith("requests_")
+                and entry.name.endswith(".jsonl")
+                and entry.stat().st_mtime < cutoff_date
+            ):
+                os.unlink(entry.path)
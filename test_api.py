@@ -1,44 +1,65 @@
 """
-Test script for the FastAPI server locally.
+Test script for the FastAPI server, run in-process via TestClient.
+
+No separately started server needed: the app is built once (cached) and
+requests go straight to it through the ASGI interface.
 """
 
-import requests
-import json
+from functools import lru_cache
+
+import orjson
+
+
+def _pp(data) -> str:
+    """Pretty-print a response payload via orjson."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
+@lru_cache(maxsize=None)
+def _client():
+    """Build the app and its TestClient once per process.
+
+    Caching means repeated calls (and repeated test runs in one process)
+    reuse the same initialized app instead of re-running startup.
+    """
+    from fastapi.testclient import TestClient
 
-BASE_URL = "http://localhost:8000"
+    from powertochoose_mcp.api_server import app
+
+    return TestClient(app)
 
 
 def test_root():
     """Test root endpoint."""
     print("Testing root endpoint...")
-    response = requests.get(f"{BASE_URL}/")
+    response = _client().get("/")
     print(f"Status: {response.status_code}")
-    print(json.dumps(response.json(), indent=2))
+    print(_pp(orjson.loads(response.content)))
     print()
 
 
 def test_health():
     """Test health check endpoint."""
     print("Testing health endpoint...")
-    response = requests.get(f"{BASE_URL}/api/health")
+    response = _client().get("/api/health")
     print(f"Status: {response.status_code}")
-    print(json.dumps(response.json(), indent=2))
+    print(_pp(orjson.loads(response.content)))
     print()
 
 
 def test_plans_browse():
     """Test browsing plans."""
     print("Testing plans browse endpoint...")
-    response = requests.get(f"{BASE_URL}/api/plans/75074")
+    response = _client().get("/api/plans/75074")
     print(f"Status: {response.status_code}")
-    print(json.dumps(response.json(), indent=2))
+    print(_pp(orjson.loads(response.content)))
     print()
 
 
 def test_csv_upload():
     """Test CSV upload (requires sample CSV)."""
     print("Testing CSV upload endpoint...")
-    
+
     # This requires a sample CSV file
     # For now, just test the endpoint without upload
     print("Note: CSV upload test requires sample file")
@@ -54,21 +75,14 @@ if __name__ == "__main__":
     print("PowerToChoose API Server - Local Tests")
     print("=" * 60)
     print()
-    
-    print("Make sure the server is running:")
-    print("  python -m powertochoose_mcp.api_server")
-    print()
-    
+
     try:
         test_root()
         test_health()
         test_plans_browse()
         test_csv_upload()
-        
+
         print("✅ All tests completed!")
-        
-    except requests.exceptions.ConnectionError:
-        print("❌ Error: Could not connect to server")
-        print("Make sure the API server is running on port 8000")
+
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -3,13 +3,24 @@
 
 from powertochoose_mcp.db.operations import SessionLocal
 from powertochoose_mcp.db.schema import Plan, PlanClassification
-from sqlalchemy import func
+from sqlalchemy import distinct, func, select
 
 db = SessionLocal()
 
-print(f"Total plans: {db.query(Plan).count()}")
-print(f"ZIP 75074: {db.query(Plan).filter(Plan.zip_code == '75074').count()}")
-print(f"Plans with classifications: {db.query(Plan.id).join(PlanClassification).distinct().count()}")
+# One round trip for all three counts instead of a query apiece
+total, zip_75074, classified = db.execute(
+    select(
+        select(func.count(Plan.id)).scalar_subquery(),
+        select(func.count(Plan.id))
+        .where(Plan.zip_code == "75074")
+        .scalar_subquery(),
+        select(func.count(distinct(PlanClassification.plan_id))).scalar_subquery(),
+    )
+).one()
+
+print(f"Total plans: {total}")
+print(f"ZIP 75074: {zip_75074}")
+print(f"Plans with classifications: {classified}")
 
 sample = db.query(Plan).first()
 if sample:
@@ -0,0 +1,48 @@
+"""Shared test fixtures."""
+
+import os
+import tempfile
+from pathlib import Path
+
+# Must be set before any powertochoose_mcp import: config builds the
+# engine URLs from DATABASE_PATH at import time. ":memory:" selects the
+# named shared-cache in-memory database, so every session in the process
+# sees one schema instead of a fresh empty DB per connection.
+os.environ["DATABASE_PATH"] = ":memory:"
+
+# Likewise read at import time; without this, every test run appends real
+# tool-call logs into the repo's data/logs/ directory.
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="powertochoose-test-logs-")
+
+# Keep numba's compiled-kernel cache inside the repo so repeat test runs
+# (and CI with a cached workspace) warm-start instead of re-JITting
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".numba_cache")
+)
+
+import pytest
+
+from powertochoose_mcp.db import init_database
+
+
+def pytest_collection_modifyitems(items):
+    """Pin serial-marked tests to one pytest-xdist worker.
+
+    Each xdist worker is its own process with its own in-memory DB, so
+    most tests parallelize freely (pytest -n auto); anything marked
+    serial is grouped onto a single worker.
+    """
+    for item in items:
+        if "serial" in item.keywords:
+            item.add_marker(pytest.mark.xdist_group("serial"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def shared_memory_db():
+    """Create the schema once for the whole suite.
+
+    The database lives in memory on the engine's pinned connection, so
+    there is nothing to tear down; it vanishes with the process.
+    """
+    init_database()
+    yield
@@ -3,7 +3,6 @@
 import pytest
 from datetime import datetime
 from powertochoose_mcp.db import (
-    init_database,
     get_session,
     store_plan,
     get_plans_by_zip,
@@ -13,35 +12,35 @@ from powertochoose_mcp.db import (
 
 
 @pytest.fixture(scope="module")
-def test_db():
-    """Initialize test database."""
-    # Use in-memory database for testing
-    import os
-    os.environ["DATABASE_PATH"] = ":memory:"
-    
-    init_database()
+def test_db(shared_memory_db):
+    """Alias for the session-scoped in-memory database fixture."""
     yield
-    
-    # Cleanup handled by in-memory database
+
+
+# Shared fixture row; tests spread-merge their overrides on top instead
+# of restating the full ~15-key literal per plan
+_BASE_PLAN = {
+    "provider": "Test Provider",
+    "contract_length_months": 12,
+    "cancellation_fee": 150.0,
+    "rate_structure": {"plan_type": "fixed", "base_charge": 9.95, "tiers": []},
+    "cost_500_kwh": {"usage_kwh": 500, "total_monthly_usd": 75.0},
+    "cost_1000_kwh": {"usage_kwh": 1000, "total_monthly_usd": 140.0},
+    "cost_2000_kwh": {"usage_kwh": 2000, "total_monthly_usd": 270.0},
+    "efl_url": "http://example.com/efl.pdf",
+    "plan_url": "http://example.com/plan",
+    "efl_parsed": True,
+}
 
 
 def test_store_and_retrieve_plan(test_db):
     """Test storing and retrieving a plan."""
     plan_data = {
+        **_BASE_PLAN,
         "id": "test_plan_001",
         "name": "Test Green Plan",
-        "provider": "Test Provider",
         "zip_code": "75035",
-        "contract_length_months": 12,
         "renewable_percentage": 100,
-        "cancellation_fee": 150.0,
-        "rate_structure": {"plan_type": "fixed", "base_charge": 9.95, "tiers": []},
-        "cost_500_kwh": {"usage_kwh": 500, "total_monthly_usd": 75.0},
-        "cost_1000_kwh": {"usage_kwh": 1000, "total_monthly_usd": 140.0},
-        "cost_2000_kwh": {"usage_kwh": 2000, "total_monthly_usd": 270.0},
-        "efl_url": "http://example.com/efl.pdf",
-        "plan_url": "http://example.com/plan",
-        "efl_parsed": True,
     }
     
     classifications = ["green", "100_renewable", "fixed_rate"]
@@ -52,9 +51,10 @@ def test_store_and_retrieve_plan(test_db):
         assert plan.id == "test_plan_001"
         assert plan.name == "Test Green Plan"
     
-    # Retrieve plan
+    # Retrieve plan; eager-load classifications in the same round trip
+    # instead of a lazy query per access
     with get_session() as session:
-        retrieved_plan = get_plan_by_id(session, "test_plan_001")
+        retrieved_plan = get_plan_by_id(session, "test_plan_001", eager=True)
         assert retrieved_plan is not None
         assert retrieved_plan.name == "Test Green Plan"
         assert retrieved_plan.zip_code == "75035"
@@ -63,30 +63,34 @@ def test_store_and_retrieve_plan(test_db):
 
 def test_get_plans_by_zip(test_db):
     """Test retrieving plans by ZIP code."""
-    # Store multiple plans
-    for i in range(3):
-        plan_data = {
+    from powertochoose_mcp.db.schema import Plan, PlanClassification
+
+    # Store multiple plans in one session with two bulk inserts instead
+    # of a session + store_plan round trip per plan
+    plan_rows = [
+        {
+            **_BASE_PLAN,
             "id": f"test_plan_zip_{i}",
             "name": f"Test Plan {i}",
-            "provider": "Test Provider",
             "zip_code": "75024",
-            "contract_length_months": 12,
             "renewable_percentage": 50,
-            "cancellation_fee": 150.0,
-            "rate_structure": {"plan_type": "fixed", "base_charge": 9.95, "tiers": []},
-            "cost_500_kwh": {"usage_kwh": 500, "total_monthly_usd": 75.0},
-            "cost_1000_kwh": {"usage_kwh": 1000, "total_monthly_usd": 140.0},
-            "cost_2000_kwh": {"usage_kwh": 2000, "total_monthly_usd": 270.0},
-            "efl_url": "http://example.com/efl.pdf",
-            "plan_url": "http://example.com/plan",
-            "efl_parsed": True,
+            "scraped_at": datetime.utcnow(),
         }
-        
-        classifications = ["green"] if i == 0 else ["fixed_rate"]
-        
-        with get_session() as session:
-            store_plan(session, plan_data, classifications)
-    
+        for i in range(3)
+    ]
+    class_rows = [
+        {
+            "plan_id": f"test_plan_zip_{i}",
+            "classification": "green" if i == 0 else "fixed_rate",
+            "source": "website",
+        }
+        for i in range(3)
+    ]
+
+    with get_session() as session:
+        session.bulk_insert_mappings(Plan, plan_rows)
+        session.bulk_insert_mappings(PlanClassification, class_rows)
+
     # Retrieve all plans for ZIP
     with get_session() as session:
         plans = get_plans_by_zip(session, "75024")
@@ -108,7 +112,11 @@ def test_log_request(test_db):
             parameters={"zip_code": "75035", "classifications": ["green"]},
             result_count=5,
         )
-    
+
+    # Entries are buffered; force them out before reading the table
+    from powertochoose_mcp.db import flush_request_logs
+    flush_request_logs()
+
     # Verify log was created
     with get_session() as session:
         from powertochoose_mcp.db.schema import RequestLog